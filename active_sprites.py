@@ -0,0 +1,33 @@
+class ActiveSprites:
+    def __init__(self):
+        #  Sprites with work to do every tick, in the order they became active (a dict used as an ordered set)
+        self.sprites = {}
+
+        #  Sprites updated in the last tick
+        self.stats = {"active_sprites": 0}
+
+
+    def add(self, sprite):
+        """Update a sprite every tick, until it is removed"""
+        self.sprites[sprite] = None
+
+
+    def remove(self, sprite):
+        """Stop updating a sprite"""
+        self.sprites.pop(sprite, None)
+
+
+    def clear(self):
+        """Remove every sprite, when the stage is cleared"""
+        self.sprites.clear()
+
+
+    def update(self):
+        """Update the active sprites. A sprite removed during the pass (by itself or another) is not updated"""
+        sprites = self.sprites
+        count = 0
+        for sprite in list(sprites):
+            if sprite in sprites:
+                sprite.update()
+                count += 1
+        self.stats["active_sprites"] = count
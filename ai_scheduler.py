@@ -0,0 +1,57 @@
+import gamesettings as gs
+
+
+class AIScheduler:
+    def __init__(self, game):
+        #  Link with the game class
+        self.GAME = game
+
+        #  Frames counted since the game started
+        self.frame = 0
+
+        #  Per frame count of the enemies updated in each tier
+        self.stats = {f"ai_tier_{tier}": 0 for tier in range(len(gs.AI_TIERS))}
+
+
+    def reset(self):
+        """Start counting frames again for a new game, so a seeded game updates its enemies in the same frames"""
+        self.frame = 0
+        for key in self.stats:
+            self.stats[key] = 0
+
+
+    def update(self, enemies):
+        """Update the enemies near the camera/player every frame, and the distant enemies at a reduced rate"""
+        self.frame += 1
+        for key in self.stats:
+            self.stats[key] = 0
+
+        for enemy in enemies:
+            #  Dying enemies have nothing to update, their animation is run by the game timers
+            if enemy.destroyed:
+                continue
+            tier = self.enemy_tier(enemy)
+            interval = gs.AI_TIERS[tier]["interval"]
+            ticks = self.frame - enemy.ai_frame
+            #  Enemies in the same tier are spread across frames by their phase
+            if ticks < interval and (self.frame + enemy.ai_phase) % interval != 0:
+                continue
+            enemy.update(ticks)
+            enemy.ai_frame = self.frame
+            self.stats[f"ai_tier_{tier}"] += 1
+
+
+    def enemy_tier(self, enemy):
+        """Return the tier of an enemy, from its distance to the camera view or the player, whichever is nearer"""
+        camera_left = self.GAME.camera_x_offset
+        camera_right = camera_left + gs.SCREENWIDTH
+        camera_distance = max(0, camera_left - enemy.rect.right, enemy.rect.left - camera_right)
+
+        player = self.GAME.player.rect
+        player_distance = max(abs(enemy.rect.centerx - player.centerx), abs(enemy.rect.centery - player.centery))
+
+        distance = min(camera_distance, player_distance)
+        for tier, settings in enumerate(gs.AI_TIERS):
+            if settings["distance"] is None or distance <= settings["distance"]:
+                return tier
+        return len(gs.AI_TIERS) - 1
@@ -2,8 +2,23 @@ import pygame
 import gamesettings as gs
 
 
+class SilentSound:
+    """Stand in for pygame.mixer.Sound when running without audio"""
+    def play(self, *args, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+
 class Assets:
-    def __init__(self):
+    def __init__(self, headless=False):
+        #  Headless assets are loaded without a display or audio device
+        self.headless = headless
+
+        #  Collision masks of the loaded animation images, keyed by image
+        self.masks = {}
+
         self.spritesheet = self.load_sprite_sheet("images", "spritesheet.png", 192*4, 272*4)
 
         self.player_char = self.load_sprite_range(gs.PLAYER, self.spritesheet)
@@ -46,7 +61,9 @@ class Assets:
 
     def load_sprite_sheet(self, path, filename, width, height):
         """Load in the sprite sheet image, and resize it"""
-        image = pygame.image.load(f"{path}/{filename}").convert_alpha()
+        image = pygame.image.load(f"{path}/{filename}")
+        if not self.headless:
+            image = image.convert_alpha()
         image = pygame.transform.scale(image, (width, height))
         return image
 
@@ -73,6 +90,7 @@ class Assets:
                 image = self.load_sprites(spritesheet, coord[1] * col, coord[0] * row, width, height)
                 if resize:
                     image = pygame.transform.scale(image, (32, 32))
+                self.masks[image] = pygame.mask.from_surface(image)
                 animation_images[animation].append(image)
         return animation_images
 
@@ -81,10 +99,18 @@ class Assets:
         """Cycle through the image list and rotate each of the images"""
         for ind, image in enumerate(image_list):
             image = pygame.transform.rotate(image, rotation)
+            self.masks[image] = pygame.mask.from_surface(image)
             image_list[ind] = image
 
+
+    def get_mask(self, image):
+        """Return the collision mask of an image, creating it if the image was not preloaded"""
+        if image not in self.masks:
+            self.masks[image] = pygame.mask.from_surface(image)
+        return self.masks[image]
+
     def load_sound_effects(self):
         sound_files = {}
         for sound in gs.SOUNDS:
-            sound_files[sound] = pygame.mixer.Sound(f"sounds/{sound}")
+            sound_files[sound] = SilentSound() if self.headless else pygame.mixer.Sound(f"sounds/{sound}")
         return sound_files
\ No newline at end of file
@@ -3,11 +3,16 @@ from specials import Special
 import gamesettings as gs
 
 
-class Blocks(pygame.sprite.Sprite):
+class Blocks(pygame.sprite.DirtySprite):
+    __slots__ = ("GAME", "row", "col", "size", "x", "y", "image_list", "image_index", "image", "mask", "rect")
+
+    #  Shared by every block: y coordinates offset, and blocks are solid
+    y_offset = gs.Y_OFFSET
+    passable = False
+
     def __init__(self, game, images, group, row_num, col_num, size):
         super().__init__(group)
         self.GAME = game
-        self.y_offset = gs.Y_OFFSET
 
         #  Position in level matrix
         self.row = row_num
@@ -20,70 +25,76 @@ class Blocks(pygame.sprite.Sprite):
         self.x = self.col * self.size
         self.y = (self.row * self.size) + self.y_offset
 
-        #  Attributes
-        self.passable = False
-
         #  Block image
         self.image_list = images
         self.image_index = 0
         self.image = self.image_list[self.image_index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
 
+        #  Register the block in the cell lookup used for collisions
+        self.GAME.cell_index.add(self, self.row, self.col)
+
 
     def update(self):
         pass
 
 
-    def draw(self, window, offset):
-        window.blit(self.image, (self.rect.x - offset, self.rect.y))
+    def kill(self):
+        self.GAME.cell_index.remove(self, self.row, self.col)
+        self.GAME.active_sprites.remove(self)
+        super().kill()
 
 
     def __repr__(self):
         return "'#'"
 
 
-class Hard_Block(Blocks):
-    def __init__(self, game, images, group, row_num, col_num, size):
-        super().__init__(game, images, group, row_num, col_num, size)
-
-
 class Soft_Block(Blocks):
+    __slots__ = ("destroyed",)
+    cell_type = gs.CELL_SOFT
+    anim_frame_time = 50
+
     def __init__(self, game, images, group, row_num, col_num, size):
         super().__init__(game, images, group, row_num, col_num, size)
 
-        self.anim_timer = pygame.time.get_ticks()
-        self.anim_frame_time = 50
-
         self.destroyed = False
 
 
     def update(self):
-        if self.destroyed:
-            if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-                self.image_index += 1
-                if self.image_index >= len(self.image_list) - 1:
-                    self.kill()
-                self.image = self.image_list[self.image_index]
-                self.anim_timer = pygame.time.get_ticks()
-            for enemy in self.GAME.groups["enemies"]:
-                if enemy.destroyed:
-                    continue
-                if not self.rect.colliderect(enemy):
-                    continue
-                if pygame.sprite.collide_mask(self, enemy):
-                    enemy.destroy()
-            if self.rect.colliderect(self.GAME.player):
-                if pygame.sprite.collide_mask(self, self.GAME.player):
-                    self.GAME.player.alive = False
-                    self.GAME.player.action = "dead_anim"
+        """Kill the enemies and player caught in the burning block, only updated while the block burns"""
+        for enemy in self.GAME.hazard_map.nearby("enemies", self.rect):
+            if enemy.destroyed:
+                continue
+            if not self.rect.colliderect(enemy):
+                continue
+            if pygame.sprite.collide_mask(self, enemy):
+                enemy.destroy()
+        if self.rect.colliderect(self.GAME.player):
+            if pygame.sprite.collide_mask(self, self.GAME.player):
+                self.GAME.player.alive = False
+                self.GAME.player.action = "dead_anim"
+
+
+    def animate(self):
+        """Show the next frame of the burning block, run by the game timers"""
+        self.image_index += 1
+        if self.image_index >= len(self.image_list) - 1:
+            self.kill()
+        else:
+            self.GAME.timers.schedule(self.anim_frame_time, self.animate)
+        self.image = self.image_list[self.image_index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
+        self.dirty = 1
 
 
     def destroy_soft_block(self):
-        """If soft block has been destroyed, change the destroyed boolean to True, and set the timer"""
+        """If soft block has been destroyed, change the destroyed boolean to True, and start the animation timer"""
         if not self.destroyed:
-            self.anim_timer = pygame.time.get_ticks()
+            self.GAME.timers.schedule(self.anim_frame_time, self.animate)
+            self.GAME.active_sprites.add(self)
             self.destroyed = True
-            self.GAME.level_matrix[self.row][self.col] = "_"
+            self.GAME.level_matrix.set_cell(self.row, self.col, "_")
 
 
     def __repr__(self):
@@ -91,6 +102,8 @@ class Soft_Block(Blocks):
 
 
 class Special_Soft_Block(Soft_Block):
+    __slots__ = ("special_type",)
+
     def __init__(self, game, images, group, row_num, col_num, size, special_type):
         super().__init__(game, images, group, row_num, col_num, size)
 
@@ -108,4 +121,4 @@ class Special_Soft_Block(Soft_Block):
                                self.special_type,
                                self.GAME.groups["specials"],
                                self.row, self.col, self.size)
-        self.GAME.level_matrix[self.row][self.col] = special_cell
\ No newline at end of file
+        self.GAME.level_matrix.set_cell(self.row, self.col, special_cell)
\ No newline at end of file
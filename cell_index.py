@@ -0,0 +1,38 @@
+import gamesettings as gs
+
+
+class CellIndex:
+    def __init__(self):
+        #  Sprites occupying each level matrix cell, keyed by (row, col)
+        self.cells = {}
+
+
+    def add(self, item, row, col):
+        """Register a sprite as occupying a cell"""
+        self.cells.setdefault((row, col), []).append(item)
+
+
+    def remove(self, item, row, col):
+        """Remove a sprite from a cell"""
+        items = self.cells.get((row, col))
+        if items and item in items:
+            items.remove(item)
+            if not items:
+                del self.cells[(row, col)]
+
+
+    def clear(self):
+        """Remove all sprites from the index"""
+        self.cells.clear()
+
+
+    def items_overlapping(self, rect, cell_type):
+        """Return the sprites of a cell type in the cells the rect overlaps (1 to 4 cells for a 64px rect)"""
+        items = []
+        cells = self.cells
+        for row in range((rect.top - gs.Y_OFFSET) // gs.SIZE, ((rect.bottom - 1 - gs.Y_OFFSET) // gs.SIZE) + 1):
+            for col in range(rect.left // gs.SIZE, ((rect.right - 1) // gs.SIZE) + 1):
+                for item in cells.get((row, col), ()):
+                    if item.cell_type == cell_type:
+                        items.append(item)
+        return items
@@ -0,0 +1,91 @@
+from collections import deque
+import gamesettings as gs
+
+
+class ChainReaction:
+    #  Row and col step of each blast direction, with its end and mid flame images
+    DIRECTIONS = [(0, -1, "left_end", "left_mid"),
+                  (0, 1, "right_end", "right_mid"),
+                  (-1, 0, "up_end", "up_mid"),
+                  (1, 0, "down_end", "down_mid")]
+
+    def __init__(self, game):
+        #  Link with the game class
+        self.GAME = game
+
+        #  Bombs detonated this tick, waiting to explode
+        self.queue = deque()
+
+        #  Bombs exploded and flames placed in the last tick
+        self.stats = {"chain_bombs": 0, "chain_flames": 0}
+
+
+    def detonate(self, bomb):
+        """Queue a bomb to explode together with the other bombs detonated this tick"""
+        if not bomb.alive():
+            return
+        bomb.kill()
+        self.queue.append(bomb)
+
+
+    def clear(self):
+        """Drop the queued bombs, when the stage is cleared"""
+        self.queue.clear()
+
+
+    def resolve(self):
+        """Explode the queued bombs and every bomb their blasts reach, then place one flame in each blast cell.
+        The bombs stay in the level matrix until the whole chain is resolved, so the blasts stop at them,
+        and the soft blocks and specials hit stop the later blasts of the chain as well"""
+        if not self.queue:
+            self.stats["chain_bombs"] = 0
+            self.stats["chain_flames"] = 0
+            return
+        matrix = self.GAME.level_matrix
+        cells = matrix.cells
+        queue = self.queue
+
+        exploded = []
+        #  Flame image of each blast cell, keyed by (row, col), and the cells of the blocks/specials hit
+        flames = {}
+        hit = set()
+        while queue:
+            bomb = queue.popleft()
+            exploded.append(bomb)
+            for row_step, col_step, end, mid in self.DIRECTIONS:
+                for distance in range(1, bomb.power + 1):
+                    row = bomb.row + row_step * distance
+                    col = bomb.col + col_step * distance
+                    if (row, col) in hit:
+                        break
+                    cell_type = cells[row, col]
+                    if cell_type == gs.CELL_EMPTY:
+                        #  End piece at the end of the power range or before a hard block, where blasts cross
+                        #  the mid piece is kept
+                        if distance == bomb.power or cells[row + row_step, col + col_step] == gs.CELL_HARD:
+                            flames.setdefault((row, col), end)
+                        else:
+                            flames[(row, col)] = mid
+                        continue
+                    if cell_type == gs.CELL_BOMB:
+                        self.detonate(matrix[row][col])
+                    elif cell_type == gs.CELL_SOFT:
+                        hit.add((row, col))
+                        matrix[row][col].destroy_soft_block()
+                    elif cell_type == gs.CELL_SPECIAL:
+                        hit.add((row, col))
+                        matrix[row][col].hit_by_explosion()
+                    break
+
+        explosions = self.GAME.groups["explosions"]
+        images = self.GAME.ASSETS.explosions
+        for bomb in exploded:
+            self.GAME.pools["explosion"].get(self.GAME, images, "centre", explosions, bomb.row, bomb.col, gs.SIZE)
+            bomb.remove_bomb_from_grid()
+        for (row, col), image in flames.items():
+            self.GAME.pools["fireball"].get(self.GAME, images[image], explosions, row, col, gs.SIZE)
+
+        #  One explosion sound for the whole chain
+        self.GAME.ASSETS.sounds["Bomberman SFX (7).wav"].play()
+        self.stats["chain_bombs"] = len(exploded)
+        self.stats["chain_flames"] = len(flames)
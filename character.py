@@ -2,19 +2,19 @@ import pygame
 import gamesettings as gs
 
 
-class Character(pygame.sprite.Sprite):
+class Character(pygame.sprite.DirtySprite):
     def __init__(self, game, image_dict, group, row_num, col_num, size):
         super().__init__(group)
         self.GAME = game
 
         # Character sounds
-        self.walk_sound_timer = pygame.time.get_ticks()
-        self.death_sound_timer = pygame.time.get_ticks()
+        self.walk_sound_timer = self.GAME.CLOCK.get_ticks()
+        self.death_sound_timer = self.GAME.CLOCK.get_ticks()
 
         self.death_sound_play = False
 
         self.delay = False
-        self.delay_timer = pygame.time.get_ticks()
+        self.delay_timer = self.GAME.CLOCK.get_ticks()
 
         #  Level Matrix Position
         self.row_num = row_num
@@ -36,13 +36,9 @@ class Character(pygame.sprite.Sprite):
                 if event.key == pygame.K_ESCAPE:
                     self.GAME.MAIN.run = False
                 elif event.key == pygame.K_SPACE:
-                    row, col = ((self.rect.centery - gs.Y_OFFSET)//gs.SIZE, self.rect.centerx // self.size)
-                    if self.GAME.level_matrix[row][col] == "_" and self.bombs_planted < self.bomb_limit:
-                        Bomb(self.GAME, self.GAME.ASSETS.bomb["bomb"],
-                             self.GAME.groups["bomb"], self.power, row, col, gs.SIZE, self.remote)
-                elif event.key == pygame.K_LCTRL and self.remote and self.GAME.groups["bomb"]:
-                    bomb_list = self.GAME.groups["bomb"].sprites()
-                    bomb_list[-1].explode()
+                    self.place_bomb()
+                elif event.key == pygame.K_LCTRL:
+                    self.remote_detonate()
 
         keys_pressed = pygame.key.get_pressed()
         if keys_pressed[pygame.K_d] or keys_pressed[pygame.K_RIGHT]:
@@ -55,14 +51,42 @@ class Character(pygame.sprite.Sprite):
             self.move("walk_down")
 
 
+    def controls(self, move=None, bomb=False, detonate=False):
+        """Apply one step of player input without pygame events (used by the headless engine)"""
+        if bomb:
+            self.place_bomb()
+        if detonate:
+            self.remote_detonate()
+        if move:
+            self.move(move)
+
+
+    def place_bomb(self):
+        """Plant a bomb in the player cell, if the cell is empty and the bomb limit not reached"""
+        #  The stage may still be being built during the level transition
+        if self.GAME.transition:
+            return
+        row, col = ((self.rect.centery - gs.Y_OFFSET)//gs.SIZE, self.rect.centerx // self.size)
+        if self.GAME.level_matrix.cells[row, col] == gs.CELL_EMPTY and self.bombs_planted < self.bomb_limit:
+            Bomb(self.GAME, self.GAME.ASSETS.bomb["bomb"],
+                 self.GAME.groups["bomb"], self.power, row, col, gs.SIZE, self.remote)
+
+
+    def remote_detonate(self):
+        """Detonate the last planted bomb, if the player has the remote ability"""
+        if self.remote and self.GAME.groups["bomb"]:
+            bomb_list = self.GAME.groups["bomb"].sprites()
+            bomb_list[-1].explode()
+
+
     def update(self):
         if self.invincibility == False:
-            #  If there are flame/explosions, then perform a collision check
-            if len(self.GAME.groups["explosions"]) > 0 and self.flame_pass == False:
-                self.deadly_collisions(self.GAME.groups["explosions"])
+            #  Perform a collision check with the flames/explosions in and around the player cell
+            if self.flame_pass == False:
+                self.deadly_collisions(self.GAME.hazard_map.nearby("flames", self.rect))
 
-            #  Perform collision detection with enemies
-            self.deadly_collisions(self.GAME.groups["enemies"])
+            #  Perform collision detection with the enemies in and around the player cell
+            self.deadly_collisions(self.GAME.hazard_map.nearby("enemies", self.rect))
 
         #  play death animation
         if self.action == "dead_anim":
@@ -72,54 +96,58 @@ class Character(pygame.sprite.Sprite):
         if not self.invincibility:
             return
 
-        if pygame.time.get_ticks() - self.invincibility_timer >= 20000:
+        if self.GAME.CLOCK.get_ticks() - self.invincibility_timer >= 20000:
             self.invincibility = False
             self.invincibility_timer = None
 
 
-    def draw(self, window, offset):
-        if self.death_sound_play == False and self.delay == False:
-            window.blit(self.image, (self.rect.x - offset, self.rect.y))
-        #pygame.draw.rect(window, gs.RED, (self.rect.x - offset, self.rect.y, 64, 64), 1)
+    def render_position(self, alpha):
+        """Return the position to draw at, interpolated between the previous and current simulation step"""
+        return (round(self.previous_pos[0] + (self.rect.x - self.previous_pos[0]) * alpha),
+                round(self.previous_pos[1] + (self.rect.y - self.previous_pos[1]) * alpha))
 
 
     def animate(self, action):
         """Switches between images in order to animate movement"""
         if self.delay == True:
-            if pygame.time.get_ticks() - self.delay_timer >= 400 and \
+            if self.GAME.CLOCK.get_ticks() - self.delay_timer >= 400 and \
                 self.death_sound_play == False:
                 self.death_sound_play = True
-                self.death_sound_timer = pygame.time.get_ticks()
+                self.death_sound_timer = self.GAME.CLOCK.get_ticks()
                 self.GAME.ASSETS.sounds["BM - 09 Miss.mp3"].play()
                 self.index = len(self.image_dict[action]) - 1
                 self.delay = False
+                self.visible = 0
                 return
             return
 
         if self.death_sound_play == True:
-            if pygame.time.get_ticks() - self.death_sound_timer >= 2500:
+            if self.GAME.CLOCK.get_ticks() - self.death_sound_timer >= 2500:
                 self.reset_player()
                 return
             return
 
-        if pygame.time.get_ticks() - self.anim_time_set >= self.anim_time:
+        if self.GAME.CLOCK.get_ticks() - self.anim_time_set >= self.anim_time:
             self.index += 1
             if self.index == len(self.image_dict[action]):
                 self.index = 0
                 if self.action == "dead_anim" and self.delay == False:
                     self.delay = True
-                    self.delay_timer = pygame.time.get_ticks()
+                    self.delay_timer = self.GAME.CLOCK.get_ticks()
+                    self.visible = 0
                     return
             #  self.index = self.index % len(self.image_dics[action])
 
             self.image = self.image_dict[action][self.index]
-            self.anim_time_set = pygame.time.get_ticks()
+            self.mask = self.GAME.ASSETS.get_mask(self.image)
+            self.dirty = 1
+            self.anim_time_set = self.GAME.CLOCK.get_ticks()
 
 
     def move(self, action):
         """Handle the movement and animations of the character"""
-        #  if player not alive, do not move
-        if not self.alive:
+        #  if player not alive, or the stage is still being built during the level transition, do not move
+        if not self.alive or self.GAME.transition:
             return
 
         #  Check if the action is different to the current self.action, reset the index num to 0
@@ -136,12 +164,12 @@ class Character(pygame.sprite.Sprite):
             self.y += direction[action]
 
         #  Play character sound when moving
-        if pygame.time.get_ticks() - self.walk_sound_timer >= 200:
+        if self.GAME.CLOCK.get_ticks() - self.walk_sound_timer >= 200:
             if self.action in ["walk_left", "walk_right"]:
                 self.GAME.ASSETS.sounds["Bomberman SFX (1).wav"].play()
             elif self.action in ["walk_up", "walk_down"]:
                 self.GAME.ASSETS.sounds["Bomberman SFX (2).wav"].play()
-            self.walk_sound_timer = pygame.time.get_ticks()
+            self.walk_sound_timer = self.GAME.CLOCK.get_ticks()
 
         #  Call the animation method
         self.animate(action)
@@ -155,38 +183,51 @@ class Character(pygame.sprite.Sprite):
         #  Update the player rectangle
         self.rect.topleft = (self.x, self.y)
 
-        #  Check for collision between player and various items
-        self.collision_detection_items(self.GAME.groups["hard_block"])
+        #  Check for collision between player and the items in the cells the player overlaps
+        self.collision_detection_rects(self.GAME.level_matrix.tile_rects(self.rect))
         if self.wall_hack == False:
-            self.collision_detection_items(self.GAME.groups["soft_block"])
+            self.collision_detection_items(self.nearby_items(gs.CELL_SOFT))
         if self.bomb_hack == False:
-            self.collision_detection_items(self.GAME.groups["bomb"])
+            self.collision_detection_items(self.nearby_items(gs.CELL_BOMB))
+
+        #  Mark the player to be redrawn
+        self.dirty = 1
+        self.GAME.observation.move(self)
 
         #  Update the Game Camera X Pos with player x Position
         self.GAME.update_x_camera_offset_player_position(self.rect.x)
 
 
+    def nearby_items(self, cell_type):
+        """Return the items of a cell type in the level matrix cells that the player overlaps"""
+        return self.GAME.cell_index.items_overlapping(self.rect, cell_type)
+
+
     def collision_detection_items(self, item_list):
-        for item in item_list:
-            if self.rect.colliderect(item) and item.passable == False:
+        self.collision_detection_rects([item.rect for item in item_list if item.passable == False])
+
+
+    def collision_detection_rects(self, rect_list):
+        for rect in rect_list:
+            if self.rect.colliderect(rect):
                 if self.action == "walk_right":
-                    if self.rect.right > item.rect.left:
-                        self.rect.right = item.rect.left
+                    if self.rect.right > rect.left:
+                        self.rect.right = rect.left
                         self.x, self.y = self.rect.topleft
                         return
                 if self.action == "walk_left":
-                    if self.rect.left < item.rect.right:
-                        self.rect.left = item.rect.right
+                    if self.rect.left < rect.right:
+                        self.rect.left = rect.right
                         self.x, self.y = self.rect.topleft
                         return
                 if self.action == "walk_up":
-                    if self.rect.top < item.rect.bottom:
-                        self.rect.top = item.rect.bottom
+                    if self.rect.top < rect.bottom:
+                        self.rect.top = rect.bottom
                         self.x, self.y = self.rect.topleft
                         return
                 if self.action == "walk_down":
-                    if self.rect.bottom > item.rect.top:
-                        self.rect.bottom = item.rect.top
+                    if self.rect.bottom > rect.top:
+                        self.rect.bottom = rect.top
                         self.x, self.y = self.rect.topleft
                         return
 
@@ -229,7 +270,11 @@ class Character(pygame.sprite.Sprite):
     def set_player_images(self):
         """Character images set"""
         self.image = self.image_dict[self.action][self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self.previous_pos = self.rect.topleft
+        self.dirty = 1
+        self.GAME.observation.track(self, "player")
 
 
     def set_player(self, image_dict):
@@ -257,11 +302,12 @@ class Character(pygame.sprite.Sprite):
         #  Character Display
         self.index = 0
         self.anim_time = 50
-        self.anim_time_set = pygame.time.get_ticks()
+        self.anim_time_set = self.GAME.CLOCK.get_ticks()
         self.image_dict = image_dict
         self.set_player_images()
 
         self.death_sound_play = False
+        self.visible = 1
 
 
     def reset_player(self):
@@ -277,11 +323,11 @@ class Character(pygame.sprite.Sprite):
         self.set_player(self.image_dict)
 
 
-    def deadly_collisions(self, group):
+    def deadly_collisions(self, items):
         if not self.alive:
             return
 
-        for item in group:
+        for item in items:
             if not self.rect.colliderect(item.rect):
                 continue
             if pygame.sprite.collide_mask(self, item):
@@ -298,7 +344,15 @@ class Character(pygame.sprite.Sprite):
         self.score += score
 
 
-class Bomb(pygame.sprite.Sprite):
+class Bomb(pygame.sprite.DirtySprite):
+    __slots__ = ("GAME", "row", "col", "size", "x", "y", "bomb_counter", "passable", "remote", "power",
+                 "index", "image_list", "image", "rect", "anim_length", "timer")
+    cell_type = gs.CELL_BOMB
+
+    #  Fuse length (in animation frames), and animation frame time shared by every bomb
+    bomb_timer = 12
+    anim_frame_time = 200
+
     def __init__(self, game, image_list, group, power, row_num, col_num, size, remote):
         super().__init__(group)
         self.GAME = game
@@ -314,7 +368,6 @@ class Bomb(pygame.sprite.Sprite):
 
         #  Bomb Attributes
         self.bomb_counter = 1
-        self.bomb_timer = 12
         self.passable = True
         self.remote = remote
         self.power = power
@@ -327,54 +380,59 @@ class Bomb(pygame.sprite.Sprite):
 
         #  Animation settings
         self.anim_length = len(self.image_list)
-        self.anim_frame_time = 200
-        self.anim_timer = pygame.time.get_ticks()
+        self.timer = self.GAME.timers.schedule(self.anim_frame_time, self.animation)
 
         #  Insert into the level matrix
         self.insert_bomb_into_grid()
+        self.GAME.cell_index.add(self, self.row, self.col)
+
+        #  Updated until the player steps off the bomb
+        self.GAME.active_sprites.add(self)
 
         #  Play sound when bomb is placed
         self.GAME.ASSETS.sounds["Bomberman SFX (3).wav"].play()
 
 
     def update(self):
-        self.animation()
         self.planted_bomb_player_collision()
-        if self.bomb_counter == self.bomb_timer and not self.remote:
-            self.explode()
-
-
-    def draw(self, window, offset):
-        window.blit(self.image, (self.rect.x - offset, self.rect.y))
 
 
     def insert_bomb_into_grid(self):
         """Adds the bomb object to the level matrix"""
-        self.GAME.level_matrix[self.row][self.col] = self
+        self.GAME.level_matrix.set_cell(self.row, self.col, self)
         self.GAME.player.bombs_planted += 1
 
 
     def animation(self):
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            self.index = self.index % self.anim_length
-            self.image = self.image_list[self.index]
-            self.anim_timer = pygame.time.get_ticks()
-            self.bomb_counter += 1
+        """Show the next frame and burn down the fuse, run by the game timers. Explode once the fuse is out"""
+        self.index += 1
+        self.index = self.index % self.anim_length
+        self.image = self.image_list[self.index]
+        self.dirty = 1
+        self.bomb_counter += 1
+        self.GAME.observation.bomb_fuse(self)
+        if self.bomb_counter == self.bomb_timer and not self.remote:
+            self.explode()
+            return
+        self.timer = self.GAME.timers.schedule(self.anim_frame_time, self.animation)
 
 
     def remove_bomb_from_grid(self):
         """Removes the bomb object from the level matrix"""
-        self.GAME.level_matrix[self.row][self.col] = "_"
+        self.GAME.level_matrix.set_cell(self.row, self.col, "_")
         self.GAME.player.bombs_planted -= 1
 
 
+    def kill(self):
+        self.GAME.cell_index.remove(self, self.row, self.col)
+        self.GAME.timers.cancel(self.timer)
+        self.GAME.active_sprites.remove(self)
+        super().kill()
+
+
     def explode(self):
-        """Destroy the bomb, and remove from the level matrix"""
-        self.kill()
-        Explosion(self.GAME, self.GAME.ASSETS.explosions, "centre", self.power,
-                  self.GAME.groups["explosions"], self.row, self.col, self.size)
-        self.remove_bomb_from_grid()
+        """Destroy the bomb, it explodes (and leaves the level matrix) with the other bombs detonated this tick"""
+        self.GAME.chain_reaction.detonate(self)
 
 
     def planted_bomb_player_collision(self):
@@ -382,16 +440,31 @@ class Bomb(pygame.sprite.Sprite):
             return
         if not self.rect.colliderect(self.GAME.player):
             self.passable = False
+            self.GAME.active_sprites.remove(self)
 
 
     def __repr__(self):
         return "'!'"
 
 
-class Explosion(pygame.sprite.Sprite):
-    def __init__(self, game, image_dict, image_type, power, group, row_num, col_num, size):
-        super().__init__(group)
+class Explosion(pygame.sprite.DirtySprite):
+    __slots__ = ("GAME", "row_num", "col_num", "size", "x", "y", "index", "timer",
+                 "image_dict", "image_type", "image", "mask", "rect")
+
+    #  Shared by every explosion
+    anim_frame_time = 75
+    passable = False
+
+    def __init__(self, game, image_dict, image_type, group, row_num, col_num, size):
+        super().__init__()
+        self.reset(game, image_dict, image_type, group, row_num, col_num, size)
+
+
+    def reset(self, game, image_dict, image_type, group, row_num, col_num, size):
+        """Set up the explosion, when created or reused from the explosion pool"""
+        self.add(group)
         self.GAME = game
+        self.dirty = 1
 
         #  Level Matrix Position
         self.row_num = row_num
@@ -404,106 +477,57 @@ class Explosion(pygame.sprite.Sprite):
 
         #  Explosion IMage and animations
         self.index = 0
-        self.anim_frame_time = 75
-        self.anim_timer = pygame.time.get_ticks()
+        self.timer = self.GAME.timers.schedule(self.anim_frame_time, self.animate)
 
         self.image_dict = image_dict
         self.image_type = image_type
 
         self.image = self.image_dict[self.image_type][self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self.GAME.observation.track(self, "flame")
+        self.GAME.hazard_map.add(self, "flames")
 
-        #  Strength
-        self.power = power
-        self.passable = False
-        self.calculate_explosive_path()
 
-        #  Play explosion sound
-        self.GAME.ASSETS.sounds["Bomberman SFX (7).wav"].play()
+    def kill(self):
+        self.GAME.observation.untrack(self)
+        self.GAME.hazard_map.remove(self)
+        self.GAME.timers.cancel(self.timer)
+        super().kill()
+        self.GAME.pools["explosion"].release(self)
 
 
-    def update(self):
-        self.animate()
+    def animate(self):
+        """Show the next frame of the explosion, run by the game timers. Removed after the last frame"""
+        self.index += 1
+        if self.index == len(self.image_dict[self.image_type]):
+            self.kill()
+            return
+        self.image = self.image_dict[self.image_type][self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
+        self.dirty = 1
+        self.timer = self.GAME.timers.schedule(self.anim_frame_time, self.animate)
 
 
-    def draw(self, window, x_offset):
-        window.blit(self.image, (self.rect.x - x_offset, self.rect.y))
+class FireBall(pygame.sprite.DirtySprite):
+    __slots__ = ("GAME", "row_num", "col_num", "size", "x", "y", "index", "timer",
+                 "image_list", "image", "mask", "rect")
 
+    #  Shared by every flame
+    anim_frame_time = 75
+    passable = False
+
+    def __init__(self, game, image_list, group, row_num, col_num, size):
+        super().__init__()
+        self.reset(game, image_list, group, row_num, col_num, size)
+
+
+    def reset(self, game, image_list, group, row_num, col_num, size):
+        """Set up the flame, when created or reused from the fireball pool"""
+        self.add(group)
+        self.GAME = game
+        self.dirty = 1
 
-    def animate(self):
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            if self.index == len(self.image_dict[self.image_type]):
-                self.kill()
-                return
-            self.image = self.image_dict[self.image_type][self.index]
-            self.anim_timer = pygame.time.get_ticks()
-
-
-    def calculate_explosive_path(self):
-        """Explode adjacent cells, dependent on power and available cells"""
-        #                   left, right, up, down
-        valid_directions = [True, True, True, True]
-        for power_cell in range(self.power):
-            #  Get a list of the 4 directions, tuple of cell values
-            directions = self.calculate_direction_cells(power_cell)
-            #  Check the cells in each direction per the directions list above
-            for ind, dir in enumerate(directions):
-                #  If the corrseponding direction in valid_directions list is False, skip
-                if not valid_directions[ind]:
-                    continue
-                #  If the current cellbeing checked is an empty cell, check the next cell in that direction
-                #  to determine type of image to display, whether it is a mid or end
-                if self.GAME.level_matrix[dir[0]][dir[1]] == "_":
-                    #  if the end of the power range, use the end piece
-                    if power_cell == self.power - 1:
-                        FireBall(self.image_dict[dir[4]], self.GAME.groups["explosions"], dir[0], dir[1], gs.SIZE)
-                    #  Check if the next cell in sequence is a barrier, use end piece if true,
-                    #  and change valid directions to False
-                    elif self.GAME.level_matrix[dir[2]][dir[3]] in self.GAME.groups["hard_block"].sprites():
-                        FireBall(self.image_dict[dir[4]], self.GAME.groups["explosions"], dir[0], dir[1], gs.SIZE)
-                        valid_directions[ind] = False
-                    #  if next cell in sequence is not a barrier, and not the end of the flame power, use mid image
-                    else:
-                        FireBall(self.image_dict[dir[5]], self.GAME.groups["explosions"], dir[0], dir[1], gs.SIZE)
-                #  If the current cell being checked is not empty, but is a bomb, detonate the bomb
-                elif self.GAME.level_matrix[dir[0]][dir[1]] in self.GAME.groups["bomb"].sprites():
-                    self.GAME.level_matrix[dir[0]][dir[1]].explode()
-                    valid_directions[ind] = False
-                #  If the current cell being checked is not empty, but is a soft block - destroy it.
-                elif self.GAME.level_matrix[dir[0]][dir[1]] in self.GAME.groups["soft_block"].sprites():
-                    self.GAME.level_matrix[dir[0]][dir[1]].destroy_soft_block()
-                    valid_directions[ind] = False
-                #  If the current cell being checked is not empty, but is a special block
-                elif self.GAME.level_matrix[dir[0]][dir[1]] in self.GAME.groups["specials"].sprites():
-                    self.GAME.level_matrix[dir[0]][dir[1]].hit_by_explosion()
-                    valid_directions[ind] = False
-                #  If the current cell being checked is not an empty cell, or a bomb, or a soft, or a special
-                else:
-                    valid_directions[ind] = False
-                    continue
-
-
-    def calculate_direction_cells(self, cell):
-        """Returns a list of the four cells in the up and down, left and right directions"""
-        left = (self.row_num, self.col_num - (cell + 1),  # Check cell immediate left
-                self.row_num, self.col_num - (cell + 2),  # Check cell left of that
-                "left_end", "left_mid")
-        right = (self.row_num, self.col_num + (cell + 1),  # Check cell immediate right
-                self.row_num, self.col_num + (cell + 2),  # Check cell right of that
-                "right_end", "right_mid")
-        up = (self.row_num - (cell + 1), self.col_num,  # Check cell immediate up
-              self.row_num - (cell + 2), self.col_num,  #  Check cell above that
-              "up_end", "up_mid")
-        down = (self.row_num + (cell + 1), self.col_num,  # Check cell immediate down
-              self.row_num + (cell + 2), self.col_num,  # Check cell below that
-              "down_end", "down_mid")
-        return [left, right, up, down]
-
-
-class FireBall(pygame.sprite.Sprite):
-    def __init__(self, image_list, group, row_num, col_num, size):
-        super().__init__(group)
         self.row_num = row_num
         self.col_num = col_num
 
@@ -512,28 +536,30 @@ class FireBall(pygame.sprite.Sprite):
         self.x = self.col_num * self.size
 
         self.index = 0
-        self.anim_frame_time = 75
-        self.anim_timer = pygame.time.get_ticks()
+        self.timer = self.GAME.timers.schedule(self.anim_frame_time, self.animate)
         self.image_list = image_list
         self.image = self.image_list[self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
-
-        self.passable = False
+        self.GAME.observation.track(self, "flame")
+        self.GAME.hazard_map.add(self, "flames")
 
 
-    def update(self):
-        self.animate()
-
-
-    def draw(self, window, x_offset):
-        window.blit(self.image, (self.rect.x - x_offset, self.rect.y))
+    def kill(self):
+        self.GAME.observation.untrack(self)
+        self.GAME.hazard_map.remove(self)
+        self.GAME.timers.cancel(self.timer)
+        super().kill()
+        self.GAME.pools["fireball"].release(self)
 
 
     def animate(self):
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            if self.index == len(self.image_list):
-                self.kill()
-                return
-            self.image = self.image_list[self.index]
-            self.anim_timer = pygame.time.get_ticks()
\ No newline at end of file
+        """Show the next frame of the flame, run by the game timers. Removed after the last frame"""
+        self.index += 1
+        if self.index == len(self.image_list):
+            self.kill()
+            return
+        self.image = self.image_list[self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
+        self.dirty = 1
+        self.timer = self.GAME.timers.schedule(self.anim_frame_time, self.animate)
\ No newline at end of file
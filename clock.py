@@ -0,0 +1,20 @@
+import gamesettings as gs
+
+
+class SimulationClock:
+    def __init__(self, rate=gs.SIMULATION_RATE):
+        #  Length of one fixed simulation step, in milliseconds
+        self.step_ms = 1000 / rate
+
+        #  Number of steps simulated so far
+        self.steps = 0
+
+
+    def get_ticks(self):
+        """Return the simulation time in milliseconds, used in place of pygame.time.get_ticks"""
+        return int(self.steps * self.step_ms)
+
+
+    def advance(self):
+        """Move the simulation time on by one step"""
+        self.steps += 1
@@ -1,22 +1,44 @@
 import pygame
 import gamesettings as gs
-from info_panel import Scoring
-from random import choice
 
 
-class Enemy(pygame.sprite.Sprite):
+class EnemyType:
+    __slots__ = ("speed", "wall_hack", "chase_player", "LoS", "see_player_hack", "LoS_blockers", "dir_mvmt")
+
+    def __init__(self, attributes):
+        """Attributes shared by every enemy of a type, built once from gs.ENEMIES"""
+        self.speed = attributes["speed"]                        #  Speed of the enemy
+        self.wall_hack = attributes["wall_hack"]                #  Enemy can move through walls
+        self.chase_player = attributes["chase_player"]          #  Enemy wil chase the player
+        self.LoS = attributes["LoS"] * gs.SIZE                  #  Distance Enemy can see player
+        self.see_player_hack = attributes["see_player_hack"]    #  Enemy can see player through walls
+
+        #  Cell types that block the enemy line of sight
+        self.LoS_blockers = (gs.CELL_HARD,) if self.see_player_hack else (gs.CELL_HARD, gs.CELL_SOFT, gs.CELL_BOMB)
+
+        #  Movement per tick in each direction
+        self.dir_mvmt = {"left": -self.speed, "right": self.speed,
+                         "up": -self.speed, "down": self.speed}
+
+
+class Enemy(pygame.sprite.DirtySprite):
+    __slots__ = ("GAME", "type", "kind", "row", "col", "size", "x", "y", "destroyed", "direction",
+                 "change_dir_timer", "index", "action", "image_dict", "image", "mask", "rect",
+                 "previous_pos", "start_pos", "end_pos", "ai_frame", "ai_phase")
+
+    #  Attributes of each enemy type, shared by the enemies of that type
+    TYPES = {name: EnemyType(attributes) for name, attributes in gs.ENEMIES.items()}
+
+    #  Direction change and animation frame times shared by every enemy
+    dir_time = 1500
+    anim_frame_time = 100
+
     def __init__(self, game, image_dict, group, type, row_num, col_num, size):
         super().__init__(group)
         self.GAME = game
         #  Type of enemy (Attributes for enemy depend on the type)
         self.type = type
-
-        #  Attributes (dependent on our enemy type)
-        self.speed = gs.ENEMIES[self.type]["speed"]        #  Speed of the enemy
-        self.wall_hack = gs.ENEMIES[self.type]["wall_hack"]  #  Enemy can move through walls
-        self.chase_player = gs.ENEMIES[self.type]["chase_player"]   #  Enemy wil chase the player
-        self.LoS = gs.ENEMIES[self.type]["LoS"] * size            #  Distance Enemy can see player
-        self.see_player_hack = gs.ENEMIES[self.type]["see_player_hack"]      #  Enemy can see player through walls
+        self.kind = self.TYPES[self.type]
 
         #  Level Matrix spawn coordinates
         self.row = row_num
@@ -30,75 +52,78 @@ class Enemy(pygame.sprite.Sprite):
         #  Other Attributes
         self.destroyed = False
         self.direction = "left"
-        self.dir_mvmt = {"left": -self.speed, "right": self.speed,
-                         "up": -self.speed, "down": self.speed}
-        self.change_dir_timer = pygame.time.get_ticks()
-        self.dir_time = 1500
+        self.change_dir_timer = self.GAME.CLOCK.get_ticks()
 
         #  Enemy Animation and Images
         self.index = 0
         self.action = f"walk_{self.direction}"
         self.image_dict = image_dict
-        self.anim_frame_time = 100
-        self.anim_timer = pygame.time.get_ticks()
+        self.GAME.timers.schedule(self.anim_frame_time, self.animate)
 
         self.image = self.image_dict[self.action][self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self.previous_pos = self.rect.topleft
+        self.GAME.observation.track(self, f"enemy_{self.type}")
+        self.GAME.hazard_map.add(self, "enemies")
 
         #  Enemy line of sight
         self.start_pos = self.rect.center
         self.end_pos = self.GAME.player.rect.center
 
+        #  AI level of detail, frame of the last update, and phase to spread the updates across frames
+        self.ai_frame = self.GAME.ai_scheduler.frame
+        self.ai_phase = len(group)
+
 
-    def update(self):
-        self.movement()
+    def update(self, ticks=1):
+        self.movement(ticks)
         self.update_line_of_sight_with_player()
-        self.animate()
 
 
-    def draw(self, window, x_offset):
-        window.blit(self.image, (self.rect.x - x_offset, self.rect.y))
-        #pygame.draw.line(window, "black", (self.start_pos[0] - x_offset, self.start_pos[1]),
-        #                 (self.end_pos[0] - x_offset, self.end_pos[1]), 2)
+    def render_position(self, alpha):
+        """Return the position to draw at, interpolated between the previous and current simulation step"""
+        return (round(self.previous_pos[0] + (self.rect.x - self.previous_pos[0]) * alpha),
+                round(self.previous_pos[1] + (self.rect.y - self.previous_pos[1]) * alpha))
 
 
-    def movement(self):
+    def movement(self, ticks=1):
         """Method that incorporates all movement conditions to enable the enemy to move around
-        the game area"""
+        the game area, moving for the number of ticks since the last update"""
         #  Return out of method, if enemy is destroyed
         if self.destroyed:
             return
 
         #  Move enemy along the x or y axis, dependent on move direction
         move_direction = self.action.split("_")[1]
+        step = self.kind.dir_mvmt[move_direction] * ticks
+        if ticks > 1:
+            step = self.limit_step_to_cell(move_direction, step)
         if move_direction in ["left", "right"]:
-            self.x += self.dir_mvmt[move_direction]
+            self.x += step
         else:
-            self.y += self.dir_mvmt[move_direction]
+            self.y += step
 
         #  Reset the directions listing for the char to choose from
         directions = ["left", "right", "up", "down"]
 
         #  Collision detection with the Hard Blocks
-        self.new_direction(self.GAME.groups["hard_block"], move_direction, directions)
+        self.new_direction(self.GAME.level_matrix.tile_rects(self.rect), move_direction, directions)
 
         #  Collision detection with the Soft Blocks
-        if self.wall_hack == False:
-            self.new_direction(self.GAME.groups["soft_block"], move_direction, directions)
+        if self.kind.wall_hack == False:
+            self.new_direction(self.nearby_rects(gs.CELL_SOFT), move_direction, directions)
 
         #  Collision detection with the Bombs
-        self.new_direction(self.GAME.groups["bomb"], move_direction, directions)
+        self.new_direction(self.nearby_rects(gs.CELL_BOMB), move_direction, directions)
 
         #  Chase the player if Applciable
-        if self.chase_player:
+        if self.kind.chase_player:
             #  if Dist greater, pass
             if self.check_LoS_distance():
                 pass
-            elif self.intersecting_items_with_LoS("hard_block"):
-                pass
-            elif self.intersecting_items_with_LoS("soft_block") and self.see_player_hack == False:
-                pass
-            elif self.intersecting_items_with_LoS("bomb") and self.see_player_hack == False:
+            #  Chase if the player is in sight, or can be reached within the LoS distance
+            elif self.intersecting_items_with_LoS() and not self.path_to_player_in_range():
                 pass
             else:
                 self.chase_the_player()
@@ -108,41 +133,58 @@ class Enemy(pygame.sprite.Sprite):
 
         #  Update the rect position of the enemy with the new x, y coordinates
         self.rect.update(self.x, self.y, self.size, self.size)
+        self.dirty = 1
+        self.GAME.observation.move(self)
+        self.GAME.hazard_map.move(self)
 
 
-    def collision_detection_blocks(self, group, direction):
+    def nearby_rects(self, cell_type):
+        """Return the rects of the items of a cell type in the level matrix cells that the enemy overlaps"""
+        items = self.GAME.cell_index.items_overlapping(self.rect, cell_type)
+        return [item.rect for item in items] if items else items
+
+
+    def limit_step_to_cell(self, direction, step):
+        """Stop a multi tick step at the next cell boundary, so the enemy still aligns with the grid"""
+        position = self.x if direction in ["left", "right"] else self.y - gs.Y_OFFSET
+        if step > 0:
+            return min(step, self.size - (position % self.size))
+        return max(step, -(position % self.size or self.size))
+
+
+    def collision_detection_blocks(self, rects, direction):
         #  Collision detection
-        for block in group:
+        for rect in rects:
             #  compare each block for collision with enemy char rect
-            if block.rect.colliderect(self.rect):
-                if direction == "left" and self.rect.right > block.rect.right:
-                    self.x = block.rect.right
+            if rect.colliderect(self.rect):
+                if direction == "left" and self.rect.right > rect.right:
+                    self.x = rect.right
                     return direction
-                if direction == "right" and self.rect.left < block.rect.left:
-                    self.x = block.rect.left - self.size
+                if direction == "right" and self.rect.left < rect.left:
+                    self.x = rect.left - self.size
                     return direction
-                if direction == "up" and self.rect.bottom > block.rect.bottom:
-                    self.y = block.rect.bottom
+                if direction == "up" and self.rect.bottom > rect.bottom:
+                    self.y = rect.bottom
                     return direction
-                if direction == "down" and self.rect.top < block.rect.top:
-                    self.y = block.rect.top - self.size
+                if direction == "down" and self.rect.top < rect.top:
+                    self.y = rect.top - self.size
                     return direction
         return None
 
 
-    def new_direction(self, group, move_direction, directions):
-        dir = self.collision_detection_blocks(group, move_direction)
+    def new_direction(self, rects, move_direction, directions):
+        dir = self.collision_detection_blocks(rects, move_direction)
         if dir:
             directions.remove(dir)
-            new_direction = choice(directions)
+            new_direction = self.GAME.rng.choice(directions)
             self.action = f"walk_{new_direction}"
-            self.change_dir_timer = pygame.time.get_ticks()
+            self.change_dir_timer = self.GAME.CLOCK.get_ticks()
 
 
     def change_directions(self, direction_list):
         """Randomly change directions after a set amount of time elapsed"""
         #  if timer has not elapsed, return out of method
-        if pygame.time.get_ticks() - self.change_dir_timer < self.dir_time:
+        if self.GAME.CLOCK.get_ticks() - self.change_dir_timer < self.dir_time:
             return
 
         #  if enemy coordinates do not align with the grid coordinates.
@@ -158,28 +200,22 @@ class Enemy(pygame.sprite.Sprite):
             return
 
         #  Check the 4 directions to see if movement is possible, update the directions list
-        if self.wall_hack == False:
+        if self.kind.wall_hack == False:
             self.determine_if_direction_valid(direction_list, row, col)
 
         #  Randomly select a new direction from the remaining list of directions
-        new_direction = choice(direction_list)
+        new_direction = self.GAME.rng.choice(direction_list)
         self.action = f"walk_{new_direction}"
 
         #  Reset the change direction timer
-        self.change_dir_timer = pygame.time.get_ticks()
+        self.change_dir_timer = self.GAME.CLOCK.get_ticks()
         return
 
 
     def determine_if_direction_valid(self, directions, row, col):
         """Check the 4 directions to determine if move is possible"""
-        if self.GAME.level_matrix[row - 1][col] != "_":
-            directions.remove("up")
-        if self.GAME.level_matrix[row + 1][col] != "_":
-            directions.remove("down")
-        if self.GAME.level_matrix[row][col - 1] != "_":
-            directions.remove("left")
-        if self.GAME.level_matrix[row][col + 1] != "_":
-            directions.remove("right")
+        open_directions = self.GAME.level_matrix.open_neighbours(row, col)
+        directions[:] = [direction for direction in directions if direction in open_directions]
 
         # if directions list empty, input "left"
         if len(directions) == 0:
@@ -188,23 +224,34 @@ class Enemy(pygame.sprite.Sprite):
 
 
     def animate(self):
-        """Cycle through the enemy animation images"""
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            if self.destroyed and self.index == len(self.image_dict[self.action]):
-                self.kill()
-                Scoring(self.GAME, self.GAME.groups["scores"], gs.SCORES[self.type], self.x, self.y)
-            self.index = self.index % len(self.image_dict[self.action])
-            self.image = self.image_dict[self.action][self.index]
-            self.anim_timer = pygame.time.get_ticks()
+        """Cycle through the enemy animation images, run by the game timers"""
+        self.index += 1
+        if self.destroyed and self.index == len(self.image_dict[self.action]):
+            self.kill()
+            self.GAME.pools["scoring"].get(self.GAME, self.GAME.groups["scores"], gs.SCORES[self.type],
+                                           self.x, self.y)
+        else:
+            self.GAME.timers.schedule(self.anim_frame_time, self.animate)
+        self.index = self.index % len(self.image_dict[self.action])
+        self.image = self.image_dict[self.action][self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
+        self.dirty = 1
+
+
+    def kill(self):
+        self.GAME.hazard_map.remove(self)
+        super().kill()
 
 
     def destroy(self):
         """Deactivate the enemy when killed"""
         self.destroyed = True
+        self.GAME.observation.untrack(self)
         self.index = 0
         self.action = "death"
         self.image = self.image_dict[self.action][self.index]
+        self.mask = self.GAME.ASSETS.get_mask(self.image)
+        self.dirty = 1
 
 
     def update_line_of_sight_with_player(self):
@@ -214,24 +261,28 @@ class Enemy(pygame.sprite.Sprite):
 
 
     def chase_the_player(self):
-        """Change the direction towards the player if in line of sight"""
-        #  Convert pixel coords to rows/col
-        enemy_col = self.start_pos[0] // self.size
-        enemy_row = self.start_pos[1] // self.size
-        player_col = self.end_pos[0] // self.size
-        player_row = self.end_pos[1] // self.size
-
-        if enemy_col > player_col and ((self.y - gs.Y_OFFSET) % self.size) + 32 == self.size//2:
-            self.action = "walk_left"
-        elif enemy_col < player_col and ((self.y - gs.Y_OFFSET) % self.size) + 32 == self.size//2:
-            self.action = "walk_right"
-        elif enemy_row > player_row and (self.x % self.size) + 32 == self.size//2:
-            self.action = "walk_up"
-        elif enemy_row < player_row and (self.x % self.size) + 32 == self.size//2:
-            self.action = "walk_down"
+        """Change the direction towards the player, following the shared distance field"""
+        #  Only change direction when the enemy is aligned with a cell
+        if self.x % self.size != 0 or (self.y - gs.Y_OFFSET) % self.size != 0:
+            return
+
+        #  Read the next step towards the player from the distance field
+        row = int((self.y - gs.Y_OFFSET) // self.size)
+        col = int(self.x // self.size)
+        step = self.GAME.flow_fields[self.kind.wall_hack].next_step(row, col)
+        if step:
+            self.action = f"walk_{step}"
 
             #  Update the enemy char change direction timer
-            self.change_dir_timer = pygame.time.get_ticks()
+            self.change_dir_timer = self.GAME.CLOCK.get_ticks()
+
+
+    def path_to_player_in_range(self):
+        """Return True if the player can be reached within the LoS distance, following the distance field"""
+        row = (self.start_pos[1] - gs.Y_OFFSET) // self.size
+        col = self.start_pos[0] // self.size
+        distance = self.GAME.flow_fields[self.kind.wall_hack].distance_from(row, col)
+        return 0 <= distance <= self.kind.LoS // self.size
 
 
     def check_LoS_distance(self):
@@ -239,15 +290,13 @@ class Enemy(pygame.sprite.Sprite):
         x_dist = abs(self.end_pos[0] - self.start_pos[0])
         y_dist = abs(self.end_pos[1] - self.start_pos[1])
 
-        if x_dist > self.LoS or y_dist > self.LoS:
+        if x_dist > self.kind.LoS or y_dist > self.kind.LoS:
             return True
 
         return False
 
 
-    def intersecting_items_with_LoS(self, group):
+    def intersecting_items_with_LoS(self):
         """Return True or False, if item obstructing LoS"""
-        for item in self.GAME.groups[group]:
-            if item.rect.clipline(self.start_pos, self.end_pos):
-                return True
-        return False
\ No newline at end of file
+        #  Walk the level cells between the enemy and the player, stopping at the first blocking cell
+        return self.GAME.level_matrix.line_blocked(self.start_pos, self.end_pos, self.kind.LoS_blockers)
\ No newline at end of file
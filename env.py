@@ -0,0 +1,188 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from headless import HeadlessBomberMan
+from observation import ObservationEncoder
+import gamesettings as gs
+
+
+class BomberManEnv:
+    #  Player inputs of each discrete action
+    ACTIONS = [{},
+               {"move": "walk_up"},
+               {"move": "walk_down"},
+               {"move": "walk_left"},
+               {"move": "walk_right"},
+               {"bomb": True},
+               {"detonate": True}]
+
+    #  Observation channels by the level matrix size, including the bottom row and right col of hard blocks
+    observation_shape = (len(ObservationEncoder.CHANNELS), gs.ROWS + 1, gs.COLS + 1)
+    observation_dtype = np.uint8
+
+    def __init__(self, max_steps=gs.ENV_MAX_STEPS):
+        """Single game environment, stepped with one of the ACTIONS at a time"""
+        self.engine = HeadlessBomberMan()
+        self.max_steps = max_steps
+
+        #  Steps taken, score and lives at the end of the last step
+        self.steps = 0
+        self.score = 0
+        self.lives = 0
+
+
+    def reset(self, seed=None):
+        """Start a new game, returns the first observation"""
+        self.engine.new_game(seed)
+        self.steps = 0
+        self.score = self.engine.GAME.player.score
+        self.lives = self.engine.GAME.player.lives
+        return self.observation()
+
+
+    def step(self, action):
+        """Advance the game one step with an action index, returns (observation, reward, done, info)"""
+        state = self.engine.step(self.ACTIONS[action])
+        self.steps += 1
+
+        player = self.engine.GAME.player
+        reward = player.score - self.score
+        if player.lives < self.lives:
+            reward += gs.ENV_LIFE_LOST_REWARD
+        self.score = player.score
+        self.lives = player.lives
+
+        done = not state["game_on"] or self.steps >= self.max_steps
+        return self.observation(), reward, done, state
+
+
+    def observation(self, out=None):
+        """Return the game's ObservationEncoder array as a read only view, which changes as the game is stepped,
+        or copy it into out"""
+        if out is None:
+            return self.engine.GAME.observation.view
+        out[:] = self.engine.GAME.observation.array
+        return out
+
+
+def vector_env_worker(connection, num_envs, max_steps, shared_names, start):
+    """Run a slice of a VectorEnv's games in a worker process, writing the results into the shared arrays"""
+    envs = [BomberManEnv(max_steps) for _ in range(num_envs)]
+    memory = [shared_memory.SharedMemory(name=name) for name in shared_names]
+    observations, rewards, dones = VectorEnv.shared_arrays(memory, start + num_envs)
+    observations, rewards, dones = observations[start:], rewards[start:], dones[start:]
+
+    while True:
+        command, data = connection.recv()
+        if command == "reset":
+            for i, env in enumerate(envs):
+                env.reset(None if data is None else data + i)
+                env.observation(observations[i])
+            connection.send(None)
+        elif command == "step":
+            infos = []
+            for i, env in enumerate(envs):
+                _, rewards[i], dones[i], info = env.step(data[i])
+                #  Finished games start again straight away, the final state is kept in the info
+                if dones[i]:
+                    env.reset()
+                env.observation(observations[i])
+                infos.append(info)
+            connection.send(infos)
+        elif command == "close":
+            break
+
+    del observations, rewards, dones
+    for block in memory:
+        block.close()
+    connection.close()
+
+
+class VectorEnv:
+    def __init__(self, num_envs, processes=None, max_steps=gs.ENV_MAX_STEPS):
+        """Many independent games, split across worker processes. The observations, rewards and dones of every
+        game are returned as batched arrays, written by the workers straight into shared memory"""
+        self.num_envs = num_envs
+        processes = min(processes or multiprocessing.cpu_count(), num_envs)
+
+        #  Shared blocks for the observations, rewards and dones
+        self.memory = [shared_memory.SharedMemory(create=True, size=size) for size in self.shared_sizes(num_envs)]
+        self.observations, self.rewards, self.dones = self.shared_arrays(self.memory, num_envs)
+
+        #  Each worker runs an even slice of the games
+        self.workers = []
+        self.connections = []
+        self.slices = []
+        start = 0
+        for worker in range(processes):
+            count = num_envs // processes + (1 if worker < num_envs % processes else 0)
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=vector_env_worker, daemon=True,
+                                              args=(child, count, max_steps,
+                                                    [block.name for block in self.memory], start))
+            process.start()
+            child.close()
+            self.workers.append(process)
+            self.connections.append(parent)
+            self.slices.append((start, start + count))
+            start += count
+
+
+    @staticmethod
+    def shared_sizes(num_envs):
+        """Return the byte sizes of the observations, rewards and dones blocks"""
+        observation_size = int(np.prod(BomberManEnv.observation_shape)) * np.dtype(BomberManEnv.observation_dtype).itemsize
+        return [num_envs * observation_size,
+                num_envs * np.dtype(np.float32).itemsize,
+                num_envs * np.dtype(np.bool_).itemsize]
+
+
+    @staticmethod
+    def shared_arrays(memory, num_envs):
+        """Return the observations, rewards and dones arrays backed by the shared blocks"""
+        observations = np.ndarray((num_envs, *BomberManEnv.observation_shape),
+                                  dtype=BomberManEnv.observation_dtype, buffer=memory[0].buf)
+        rewards = np.ndarray((num_envs,), dtype=np.float32, buffer=memory[1].buf)
+        dones = np.ndarray((num_envs,), dtype=np.bool_, buffer=memory[2].buf)
+        return observations, rewards, dones
+
+
+    def reset(self, seed=None):
+        """Start a new game in every environment, game i is seeded with seed + i. Returns the observations"""
+        for connection, (start, end) in zip(self.connections, self.slices):
+            connection.send(("reset", None if seed is None else seed + start))
+        for connection in self.connections:
+            connection.recv()
+        return self.observations
+
+
+    def step(self, actions):
+        """Step every game with its action, returns (observations, rewards, dones, infos).
+        Games that finish are reset, their returned observation is the start of the next game.
+        The returned arrays are views of the shared memory, and are overwritten by the next step"""
+        for connection, (start, end) in zip(self.connections, self.slices):
+            connection.send(("step", [int(action) for action in actions[start:end]]))
+        infos = []
+        for connection in self.connections:
+            infos.extend(connection.recv())
+        return self.observations, self.rewards, self.dones, infos
+
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.workers:
+            process.join()
+        del self.observations, self.rewards, self.dones
+        for block in self.memory:
+            block.close()
+            block.unlink()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
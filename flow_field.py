@@ -0,0 +1,69 @@
+from collections import deque
+import numpy as np
+
+
+class FlowField:
+    #  Row/col change of each movement direction
+    DIRECTIONS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+    #  Direction to step back towards a cell the search came from
+    REVERSE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+    def __init__(self, passable_types):
+        #  Cell types that can be walked through
+        self.passable_types = passable_types
+
+        #  Steps from each cell to the target (-1 if unreachable), and the direction of the first step
+        self.distance = []
+        self.steps = []
+
+        #  Grid state the field was calculated for
+        self.grid = None
+        self.grid_version = None
+        self.target = None
+
+
+    def update(self, grid, target):
+        """Recalculate the field if the target cell or the level grid has changed since the last calculation"""
+        if grid is self.grid and grid.version == self.grid_version and target == self.target:
+            return False
+        self.grid = grid
+        self.grid_version = grid.version
+        self.target = target
+        self.calculate(grid, target)
+        return True
+
+
+    def calculate(self, grid, target):
+        """Breadth first search outwards from the target cell over the passable cells"""
+        passable = np.isin(grid.cells, self.passable_types).tolist()
+        distance = [[-1] * grid.cols for _ in range(grid.rows)]
+        steps = [[None] * grid.cols for _ in range(grid.rows)]
+
+        target_row, target_col = target
+        distance[target_row][target_col] = 0
+        queue = deque([target])
+        while queue:
+            row, col = queue.popleft()
+            for direction, (row_change, col_change) in self.DIRECTIONS.items():
+                next_row, next_col = row + row_change, col + col_change
+                if not (0 <= next_row < grid.rows and 0 <= next_col < grid.cols):
+                    continue
+                if distance[next_row][next_col] != -1 or not passable[next_row][next_col]:
+                    continue
+                distance[next_row][next_col] = distance[row][col] + 1
+                #  Moving back along the search direction leads one step closer to the target
+                steps[next_row][next_col] = self.REVERSE[direction]
+                queue.append((next_row, next_col))
+
+        self.distance = distance
+        self.steps = steps
+
+
+    def distance_from(self, row, col):
+        """Return the number of steps from a cell to the target, -1 if unreachable"""
+        return self.distance[row][col]
+
+
+    def next_step(self, row, col):
+        """Return the direction to move from a cell towards the target, None if there is none"""
+        return self.steps[row][col]
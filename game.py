@@ -1,24 +1,45 @@
 import pygame
-from character import Character
+from character import Character, Explosion, FireBall
 from enemy import Enemy
-from blocks import Hard_Block, Soft_Block, Special_Soft_Block
-from random import choice, randint
-from info_panel import InfoPanel
+from blocks import Soft_Block, Special_Soft_Block
+import random
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from info_panel import InfoPanel, Scoring
+from renderer import Renderer, blit_sequence
+from cell_index import CellIndex
+from level_grid import LevelGrid, NoFreeCellError
+from flow_field import FlowField
+from ai_scheduler import AIScheduler
+from observation import ObservationEncoder
+from pool import SpritePool
+from timers import TimerScheduler
+from chain_reaction import ChainReaction
+from hazard_map import HazardMap
+from active_sprites import ActiveSprites
 import gamesettings as gs
 
 
 class Game:
-    def __init__(self, main, assets):
-        #  Link with the main class and assets
+    def __init__(self, main, assets, clock):
+        #  Link with the main class, assets and simulation clock
         self.MAIN = main
         self.ASSETS = assets
+        self.CLOCK = clock
 
         #  Camera Offset
         self.camera_x_offset = 0
+        self.previous_camera_x_offset = 0
+
+        #  Fraction of a simulation step between the last step and the frame being drawn
+        self.render_alpha = 1.0
+
+        #  Level Renderer
+        self.renderer = Renderer(self)
 
         #  Groups
-        self.groups = {"hard_block": pygame.sprite.Group(),
-                       "soft_block": pygame.sprite.Group(),
+        self.groups = {"soft_block": pygame.sprite.Group(),
                        "bomb": pygame.sprite.Group(),
                        "specials": pygame.sprite.Group(),
                        "explosions": pygame.sprite.Group(),
@@ -26,6 +47,63 @@ class Game:
                        "player": pygame.sprite.Group(),
                        "scores": pygame.sprite.Group()}
 
+        #  Pools of the short lived sprites, reused instead of allocated for every explosion and enemy killed
+        self.pools = {"explosion": SpritePool(Explosion, "explosion"),
+                      "fireball": SpritePool(FireBall, "fireball"),
+                      "scoring": SpritePool(Scoring, "scoring")}
+
+        #  Cell lookup of the solid sprites (soft blocks and bombs)
+        self.cell_index = CellIndex()
+
+        #  Cell lookup of the flames and enemies, for the kill checks
+        self.hazard_map = HazardMap()
+
+        #  Distance fields towards the player shared by the chasing enemies, keyed by the enemy wall hack
+        self.flow_fields = {False: FlowField((gs.CELL_EMPTY, gs.CELL_SPECIAL)),
+                            True: FlowField((gs.CELL_EMPTY, gs.CELL_SPECIAL, gs.CELL_SOFT))}
+
+        #  Enemy AI level of detail updates
+        self.ai_scheduler = AIScheduler(self)
+
+        #  Animation frame and expiry timers of the sprites, run when due instead of polled by every sprite
+        self.timers = TimerScheduler(self.CLOCK)
+
+        #  Bombs detonated each tick, exploded together in one pass
+        self.chain_reaction = ChainReaction(self)
+
+        #  Sprites with work to do every tick (burning blocks, bombs the player is on, specials near the player),
+        #  and the player cell they were last checked against
+        self.active_sprites = ActiveSprites()
+        self.player_cell = None
+
+        #  Multi-channel array of the game state, for bots and analytics
+        self.observation = ObservationEncoder(gs.ROWS + 1, gs.COLS + 1)
+
+        #  Private random number generators: the stage seeds of a game, and the stage generation/enemy AI
+        self.seed_rng = random.Random()
+        self.rng = random.Random()
+        self.stage_seed = 0
+        self.next_stage_seed = 0
+
+        #  Stage layouts generated so far, keyed by (stage, seed), most recently used last
+        self.layout_cache = OrderedDict()
+
+        #  Worker thread planning the next stage layout while the current stage is played, and its pending layouts
+        self.layout_worker = ThreadPoolExecutor(max_workers=1)
+        self.precomputed_layouts = {}
+
+        #  Time taken by the last enemy spawn during play, and the spawns that found no empty cell
+        self.spawn_stats = {"spawn_ms": 0, "spawn_failed": 0}
+
+        #  Sprites of the stage still to be built, a few each frame during the level transition
+        self.stage_build_queue = deque()
+
+        #  Background and hard blocks of the level, the same for every stage
+        self.level_background = None
+
+        #  Scores still showing on screen, the score of any further enemy killed is doubled
+        self.score_bonus = 0
+
         #  Level Transition
         self.transition = False
         self.level_transition = None
@@ -96,124 +174,244 @@ class Game:
         #  Udpate the info panel
         self.level_info.update()
 
-        for value in self.groups.values():
-            for item in value:
-                item.update()
+        #  Wake the specials around the player when the player changes cell
+        player_cell = LevelGrid.rect_cell(self.player.rect)
+        if player_cell != self.player_cell:
+            self.player_cell = player_cell
+            self.activate_specials(player_cell)
+
+        #  Update the chasing enemies distance fields, if the player has changed cell or the level has changed
+        self.update_flow_fields(player_cell)
+
+        #  Run the sprite timers that are due this tick, then explode the bombs detonated by the player or fuses
+        self.timers.update()
+        self.chain_reaction.resolve()
+
+        #  Update only the sprites with work to do, the static blocks, idle bombs, far away specials and the
+        #  flames/scores (run by the timers) are skipped
+        self.active_sprites.update()
+
+        #  Enemies are updated at a rate depending on their distance from the camera and player
+        self.ai_scheduler.update(self.groups["enemies"])
+        self.player.update()
 
         # Perform enemy collision check with explosions, only if there is an explosion
         if self.groups["explosions"]:
-            #  Compare explosions group with the enemies group, check for collisions. This will return a dictionary
-            #  keys: group 1, values: list of all group 2 that collision detection occurs
-            killed_enemies = pygame.sprite.groupcollide(self.groups["explosions"], self.groups["enemies"], False, False)
-            if killed_enemies:
-                #  Cycle through the dictionary, preforming checks on each enemy colliding with a flame
-                for flame, enemies in killed_enemies.items():
-                    #  Cycle through each enemy in the dictionary values(list)
-                    for enemy in enemies:
-                        if pygame.sprite.collide_mask(flame, enemy):
-                            enemy.destroy()
+            #  Only the enemies in and around the cell of each flame are checked
+            for flame in self.groups["explosions"]:
+                for enemy in self.hazard_map.nearby("enemies", flame.rect):
+                    if not flame.rect.colliderect(enemy.rect):
+                        continue
+                    if pygame.sprite.collide_mask(flame, enemy):
+                        enemy.destroy()
+
+
+    def begin_step(self):
+        """Store the positions of the moving sprites and camera before a simulation step, for interpolation"""
+        self.previous_camera_x_offset = self.camera_x_offset
+        if not self.game_on:
+            return
+        for key in ["player", "enemies"]:
+            for item in self.groups[key]:
+                item.previous_pos = item.rect.topleft
 
 
-    def draw(self, window):
-        #  Fill the background
-        window.fill(gs.GREY)
+    def render_camera_x_offset(self):
+        """Return the camera x offset, interpolated between the last two simulation steps"""
+        return round(self.previous_camera_x_offset +
+                     (self.camera_x_offset - self.previous_camera_x_offset) * self.render_alpha)
 
+
+    def draw(self, window, alpha=1.0):
+        """Draw the current screen, returns the list of changed screen areas, or None if the whole screen changed"""
+        self.render_alpha = alpha
         if not self.game_on:
+            self.renderer.force_full_redraw()
+            window.fill(gs.GREY)
             window.blit(self.ASSETS.start_screen, (0, 0))
             window.blit(self.ASSETS.start_screen_pointer, (self.pointer_pos))
             if self.top_score_img:
-                for i, img in enumerate(self.top_score_img):
-                    window.blit(img, (798 + ((i - len(self.top_score_img)) * 32), 762))
-            return
+                blit_sequence(window, [(img, (798 + ((i - len(self.top_score_img)) * 32), 762))
+                                       for i, img in enumerate(self.top_score_img)])
+            return None
 
         if self.transition:
+            self.renderer.force_full_redraw()
             self.level_transition.draw(window)
-            return
+            return None
+
+        return self.renderer.draw(window)
+
+
+    def update_flow_fields(self, player_cell):
+        """Recalculate the distance fields towards the player cell, once per tick"""
+        for flow_field in self.flow_fields.values():
+            flow_field.update(self.level_matrix, player_cell)
 
-        #  Draw information panel to screen
-        self.level_info.draw(window)
 
-        #  Draw the Green Background Squares
-        for row_num, row in enumerate(self.level_matrix):
-            for col_num, col in enumerate(row):
-                window.blit(self.ASSETS.background["background"][0],
-                            ((col_num * gs.SIZE) - self.camera_x_offset, (row_num * gs.SIZE) + gs.Y_OFFSET))
+    def activate_specials(self, player_cell):
+        """Update the specials in and around the player cell every tick, the only specials the player can touch"""
+        row, col = player_cell
+        cells = self.level_matrix.cells
+        for near_row in range(max(row - 1, 0), min(row + 2, gs.ROWS)):
+            for near_col in range(max(col - 1, 0), min(col + 2, gs.COLS)):
+                if cells[near_row, near_col] == gs.CELL_SPECIAL:
+                    self.active_sprites.add(self.level_matrix[near_row][near_col])
 
 
-        for value in self.groups.values():
-            for item in value:
-                item.draw(window, self.camera_x_offset)
+    def frame_stats(self):
+        """Return the per-frame counters of the game subsystems"""
+        stats = {}
+        stats.update(self.renderer.stats)
+        stats.update(self.ai_scheduler.stats)
+        stats.update(self.timers.stats)
+        stats.update(self.chain_reaction.stats)
+        stats.update(self.active_sprites.stats)
+        stats.update(self.spawn_stats)
+        for pool in self.pools.values():
+            stats.update(pool.stats)
+        return stats
 
 
     def generate_level_matrix(self, rows, cols):
-        """Generate the basic level matrix"""
-        matrix = []
-        for row in range(rows + 1):
-            line = []
-            for col in range(cols + 1):
-                line.append("_")
-            matrix.append(line)
-        self.insert_hard_blocks_into_matrix(matrix)
-        self.insert_soft_blocks_into_matrix(matrix)
-        self.insert_power_up_into_matrix(matrix, self.level_special)
-        self.insert_power_up_into_matrix(matrix, "exit")
-        self.insert_enemies_into_level(matrix)
+        """Set up an empty level matrix for the stage, and queue the sprites of its layout to be built in batches
+        by build_stage_batch (the layout comes from the cache, the background worker, or is planned now)"""
+        self.observation.reset()
+        self.rng.seed(self.level * 2**32 + self.stage_seed)
+        matrix = LevelGrid(rows + 1, cols + 1, self.observation)
+        if self.level_background is None:
+            self.level_background = self.generate_level_background(matrix)
+        self.renderer.force_full_redraw()
+        self.queue_stage_build(matrix, self.stage_layout(self.level, self.stage_seed))
         return matrix
 
 
-    def insert_hard_blocks_into_matrix(self, matrix):
-        """Inserts all of the Hard Barrier Blocks into the level matrix"""
-        for row_num, row in enumerate(matrix):
-            for col_num, col in enumerate(row):
-                if row_num == 0 or row_num == len(matrix)-1 or \
-                    col_num == 0 or col_num == len(row)-1 or \
-                        (row_num % 2 == 0 and col_num % 2 == 0):
-                    matrix[row_num][col_num] = Hard_Block(self, self.ASSETS.hard_block["hard_block"],
-                                                          self.groups["hard_block"], row_num, col_num, gs.SIZE)
-        return
+    def set_stage_seed(self, seed=None):
+        """Set the seed of the current stage, the next seed of the game seed if None"""
+        if seed is not None and seed != self.next_stage_seed:
+            #  The layout planned in the background for the skipped seed will not be used
+            stale = self.precomputed_layouts.pop((self.level, self.next_stage_seed), None)
+            if stale:
+                stale.cancel()
+        self.stage_seed = self.next_stage_seed if seed is None else seed
+        self.next_stage_seed = self.seed_rng.getrandbits(32)
+        self.rng.seed(self.level * 2**32 + self.stage_seed)
+
+
+    def stage_layout(self, level, seed):
+        """Return the layout of a stage, from the layout cache or the background worker, planning it if neither
+        has it"""
+        key = (level, seed)
+        if key in self.layout_cache:
+            self.layout_cache.move_to_end(key)
+            return self.layout_cache[key]
+
+        precomputed = self.precomputed_layouts.pop(key, None)
+        layout = precomputed.result() if precomputed else self.plan_layout(level, seed, self.player_start_cell())
+        self.layout_cache[key] = layout
+        if len(self.layout_cache) > gs.LAYOUT_CACHE_SIZE:
+            self.layout_cache.popitem(last=False)
+        return layout
+
+
+    def precompute_next_stage(self):
+        """Start planning the layout of the next stage in the background worker, while this stage is played"""
+        key = (self.level + 1, self.next_stage_seed)
+        if key not in self.layout_cache and key not in self.precomputed_layouts:
+            self.precomputed_layouts[key] = self.layout_worker.submit(self.plan_layout, *key, self.player_start_cell())
+
+
+    def player_start_cell(self):
+        """Return the (row, col) the player starts each stage in"""
+        return self.player.row_num, self.player.col_num
+
+
+    def plan_layout(self, level, seed, start_cell):
+        """Plan the layout of a stage from its seed without creating any sprites or reading the game state, so it
+        can run in a worker thread. The cells around the player start cell are kept clear.
+        Returns the cell types as bytes, the power up and exit cells, and the enemy spawns"""
+        rng = random.Random(level * 2**32 + seed)
+        matrix = LevelGrid(gs.ROWS + 1, gs.COLS + 1)
+        matrix.cells[matrix.hard_block_cells()] = gs.CELL_HARD
+        self.insert_soft_blocks_into_matrix(matrix, rng, start_cell)
+        power_up = self.insert_power_up_into_matrix(matrix, rng, start_cell)
+        exit = self.insert_power_up_into_matrix(matrix, rng, start_cell)
+        enemies = self.insert_enemies_into_level(matrix, self.select_enemies_to_spawn(level, rng), rng, start_cell)
+        return {"cells": matrix.cells.tobytes(), "power_up": power_up, "exit": exit, "enemies": enemies}
+
+
+    def queue_stage_build(self, matrix, layout):
+        """Fill in the hard block tiles of a stage layout, and queue its sprites to be built: the soft blocks
+        (with the power up and exit), then the enemies"""
+        cells = matrix.cells_from_bytes(layout["cells"])
+        specials = {layout["power_up"]: self.level_special, layout["exit"]: "exit"}
+        matrix.set_tiles(cells == gs.CELL_HARD, gs.CELL_HARD)
+        self.stage_build_queue.clear()
+        for row_num, col_num in matrix.cell_list(cells == gs.CELL_SOFT):
+            self.stage_build_queue.append((self.build_soft_block, matrix, row_num, col_num,
+                                           specials.get((row_num, col_num))))
+        for enemy, row_num, col_num in layout["enemies"]:
+            self.stage_build_queue.append((self.build_enemy, enemy, row_num, col_num))
+
+
+    def build_stage_batch(self, count=gs.STAGE_BUILD_BATCH):
+        """Build the next sprites of the stage build queue, returns True once the stage is complete"""
+        for _ in range(min(count, len(self.stage_build_queue))):
+            build, *args = self.stage_build_queue.popleft()
+            build(*args)
+        return not self.stage_build_queue
+
+
+    def finish_stage_build(self):
+        """Build all the sprites left in the stage build queue"""
+        self.build_stage_batch(len(self.stage_build_queue))
+
+
+    def build_soft_block(self, matrix, row_num, col_num, special=None):
+        if special:
+            block = Special_Soft_Block(self, self.ASSETS.soft_block["soft_block"], self.groups["soft_block"],
+                                       row_num, col_num, gs.SIZE, special)
+        else:
+            block = Soft_Block(self, self.ASSETS.soft_block["soft_block"], self.groups["soft_block"],
+                               row_num, col_num, gs.SIZE)
+        matrix.set_cell(row_num, col_num, block)
+
+
+    def build_enemy(self, enemy, row_num, col_num):
+        Enemy(self, self.ASSETS.enemies[enemy], self.groups["enemies"], enemy, row_num, col_num, gs.SIZE)
+
+
+    def generate_level_background(self, matrix):
+        """Pre-render the static parts of the level (green background and hard blocks) onto one surface"""
+        background = pygame.Surface((matrix.cols * gs.SIZE, matrix.rows * gs.SIZE))
+        for row_num in range(matrix.rows):
+            for col_num in range(matrix.cols):
+                background.blit(self.ASSETS.background["background"][0], (col_num * gs.SIZE, row_num * gs.SIZE))
+        for row_num, col_num in matrix.cell_list(matrix.hard_block_cells()):
+            background.blit(self.ASSETS.hard_block["hard_block"][0], (col_num * gs.SIZE, row_num * gs.SIZE))
+        return background
 
 
-    def insert_soft_blocks_into_matrix(self, matrix):
-        """Randomly insert soft blocks into the level matrix"""
-        for row_num, row in enumerate(matrix):
-            for col_num, col in enumerate(row):
-                if row_num == 0 or row_num == len(matrix) - 1 or \
-                        col_num == 0 or col_num == len(row) - 1 or \
-                        (row_num % 2 == 0 and col_num % 2 == 0):
-                    continue
-                elif row_num in [2, 3, 4] and col_num in [1, 2, 3]:
-                    continue
-                else:
-                    cell = choice(["@", "_", "_", "_"])
-                    if cell == "@":
-                        cell = Soft_Block(self, self.ASSETS.soft_block["soft_block"],
-                                          self.groups["soft_block"], row_num, col_num, gs.SIZE)
-                    matrix[row_num][col_num] = cell
+    def player_start_area(self, matrix, start_cell):
+        """Return a mask of the cells around the player start cell, which are kept clear"""
+        return matrix.cells_within(*start_cell, 1)
+
+
+    def insert_soft_blocks_into_matrix(self, matrix, rng, start_cell):
+        """Randomly insert soft blocks into the level matrix cell types"""
+        valid_cells = matrix.free_cells() & ~self.player_start_area(matrix, start_cell)
+        for row_num, col_num in matrix.cell_list(valid_cells):
+            if rng.choice(["@", "_", "_", "_"]) == "@":
+                matrix.cells[row_num, col_num] = gs.CELL_SOFT
         return
 
 
-    def insert_power_up_into_matrix(self, matrix, special):
-        """Randomly insert the special Block into the level matrix"""
-        power_up = special
-        valid = False
-        while not valid:
-            row = randint(0, gs.ROWS)
-            col = randint(0, gs.COLS)
-            if row == 0 or row == len(matrix) - 1 or col == 0 or col == len(matrix[0]) - 1:
-                continue
-            elif row % 2 == 0 and col % 2 == 0:
-                continue
-            elif row in [2, 3, 4] and col in [1, 2, 3]:
-                continue
-            elif matrix[row][col] != "_":
-                continue
-            else:
-                valid = True
-        cell = Special_Soft_Block(self,
-                                  self.ASSETS.soft_block["soft_block"],
-                                  self.groups["soft_block"],
-                                  row, col, gs.SIZE, power_up)
-        matrix[row][col] = cell
+    def insert_power_up_into_matrix(self, matrix, rng, start_cell):
+        """Randomly choose a free cell for a special Block, returns the (row, col)"""
+        valid_cells = matrix.free_cells() & ~self.player_start_area(matrix, start_cell)
+        row, col = rng.choice(matrix.cell_list(valid_cells))
+        matrix.cells[row, col] = gs.CELL_SOFT
+        return row, col
 
 
     def update_x_camera_offset_player_position(self, player_x_pos):
@@ -222,30 +420,15 @@ class Game:
             self.camera_x_offset = player_x_pos - 576
 
 
-    def insert_enemies_into_level(self, matrix, enemies=None):
-        """Randomly insert enemies into the level, using level matrix for valid locations"""
-        enemies_list = self.select_enemies_to_spawn() if enemies == None else enemies
-        #  Get grid coordinates of the player character
-        pl_col = self.player.col_num
-        pl_row = self.player.row_num
+    def insert_enemies_into_level(self, matrix, enemies_list, rng, start_cell):
+        """Randomly choose the enemy spawn cells, using level matrix for valid locations.
+        Returns a tuple of (enemy, row, col)"""
+        #  Valid cells are empty, and not within 3 blocks of the player start cell
+        valid_cells = matrix.cell_list(matrix.free_cells() & ~matrix.cells_within(*start_cell, 3))
+        if not valid_cells:
+            return ()
 
-        #  Load in the enemies
-        for enemy in enemies_list:
-            valid_choice = False
-            while not valid_choice:
-                row = randint(0, gs.ROWS)
-                col = randint(0, gs.COLS)
-
-                #  Check if this row/col within 3 blocks of the player
-                if row in [pl_row-3, pl_row-2, pl_row-1, pl_row, pl_row+1, pl_row+2, pl_row+3] and \
-                    col in [pl_col-3, pl_col-2, pl_col-1, pl_col, pl_col+1, pl_col+2, pl_col+3]:
-                    continue
-
-                elif matrix[row][col] == "_":
-                    valid_choice = True
-                    Enemy(self, self.ASSETS.enemies[enemy], self.groups["enemies"], enemy, row, col, gs.SIZE)
-                else:
-                    continue
+        return tuple((enemy, *rng.choice(valid_cells)) for enemy in enemies_list)
 
 
     def regenerate_stage(self):
@@ -255,46 +438,65 @@ class Game:
             if key == "player":
                 continue
             self.groups[key].empty()
+        self.cell_index.clear()
+        self.hazard_map.clear()
+        self.timers.clear()
+        self.chain_reaction.clear()
+        self.active_sprites.clear()
+        self.player_cell = None
 
-        #  Clear the level matrix
-        self.level_matrix.clear()
         self.level_info.set_timer()
         self.level_matrix = self.generate_level_matrix(gs.ROWS, gs.COLS)
 
         #  Reset the camera x Position back to zero
         self.camera_x_offset = 0
+        self.previous_camera_x_offset = 0
         self.level_transition = LevelTransition(self, self.ASSETS, self.level)
         self.music_playing = False
 
 
-    def select_enemies_to_spawn(self):
+    def spawn_enemies(self, enemies_list):
+        """Spawn enemies during play into random empty cells, more than 3 cells from the player"""
+        start = time.perf_counter()
+        row, col = LevelGrid.rect_cell(self.player.rect)
+        try:
+            cells = self.level_matrix.pick_free_cells(len(enemies_list), self.rng, row, col, 3)
+        except NoFreeCellError:
+            self.spawn_stats["spawn_failed"] += 1
+            cells = []
+        for enemy, (row_num, col_num) in zip(enemies_list, cells):
+            self.build_enemy(enemy, row_num, col_num)
+        self.spawn_stats["spawn_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+
+    def select_enemies_to_spawn(self, level, rng):
         """Generate a list of enemies to spawn"""
         enemies_list = []
         enemies = {0: "ballom", 1: "ballom", 2: "onil", 3: "dahl", 4: "minvo", 5: "doria",
                    6: "ovape", 7: "pass", 8: "pontan"}
 
-        if self.level <= 8:
-            self.add_enemies_to_list(8, 2, 0, enemies, enemies_list)
-        elif self.level <= 17:
-            self.add_enemies_to_list(7, 2, 1, enemies, enemies_list)
-        elif self.level <= 26:
-            self.add_enemies_to_list(6, 3, 1, enemies, enemies_list)
-        elif self.level <= 35:
-            self.add_enemies_to_list(5, 3, 2, enemies, enemies_list)
-        elif self.level <= 45:
-            self.add_enemies_to_list(4, 4, 2, enemies, enemies_list)
+        if level <= 8:
+            self.add_enemies_to_list(level, rng, 8, 2, 0, enemies, enemies_list)
+        elif level <= 17:
+            self.add_enemies_to_list(level, rng, 7, 2, 1, enemies, enemies_list)
+        elif level <= 26:
+            self.add_enemies_to_list(level, rng, 6, 3, 1, enemies, enemies_list)
+        elif level <= 35:
+            self.add_enemies_to_list(level, rng, 5, 3, 2, enemies, enemies_list)
+        elif level <= 45:
+            self.add_enemies_to_list(level, rng, 4, 4, 2, enemies, enemies_list)
         else:
-            self.add_enemies_to_list(3, 4, 4, enemies, enemies_list)
+            self.add_enemies_to_list(level, rng, 3, 4, 4, enemies, enemies_list)
         return enemies_list
 
 
-    def add_enemies_to_list(self, num_1, num_2, num_3, enemies, enemies_list):
+    def add_enemies_to_list(self, level, rng, num_1, num_2, num_3, enemies, enemies_list):
         for num in range(num_1):
             enemies_list.append("ballom")
         for num in range(num_2):
-            enemies_list.append(enemies[(self.level % 9)])
+            enemies_list.append(enemies[(level % 9)])
         for num in range(num_3):
-            enemies_list.append(choice(list(enemies.values())))
+            enemies_list.append(rng.choice(list(enemies.values())))
         return
 
 
@@ -306,7 +508,7 @@ class Game:
         elif self.level == 1:
             power_up = "bomb_up"
         elif self.player.bomb_limit <= 2 or self.player.power <= 2:
-            power_up = choice(["bomb_up", "fire_up"])
+            power_up = self.rng.choice(["bomb_up", "fire_up"])
         else:
             if self.player.wall_hack:
                 specials.remove("wall_hack")
@@ -320,22 +522,36 @@ class Game:
                 specials.remove("bomb_up")
             if self.player.power == 10:
                 speciasl.remove("fire_up")
-            power_up = choice(specials)
+            power_up = self.rng.choice(specials)
         return power_up
 
 
-    def new_stage(self):
-        """Increase the stage level number, and selects a new level special"""
+    def new_stage(self, seed=None):
+        """Increase the stage level number, and selects a new level special.
+        The stage is generated from the seed, or the next seed of the game if None"""
         self.level += 1
+        self.set_stage_seed(seed)
         self.level_special = self.select_a_special()
         self.player.set_player_position()
         self.player.set_player_images()
         self.regenerate_stage()
+        self.precompute_next_stage()
 
 
-    def new_game(self):
+    def new_game(self, seed=None):
+        """Start a new game, the seed of each stage is drawn from the game seed (a random seed if None)"""
+        self.seed_rng.seed(random.getrandbits(32) if seed is None else seed)
+        self.next_stage_seed = self.seed_rng.getrandbits(32)
+        self.precomputed_layouts.clear()
         for keys, values in self.groups.items():
             self.groups[keys].empty()
+        self.cell_index.clear()
+        self.hazard_map.clear()
+        self.timers.clear()
+        self.chain_reaction.clear()
+        self.active_sprites.clear()
+        self.player_cell = None
+        self.ai_scheduler.reset()
 
         #  Player Character
         self.player = Character(self, self.ASSETS.player_char, self.groups["player"], 3, 2, gs.SIZE)
@@ -343,12 +559,14 @@ class Game:
         #  Level Information
         self.game_on = True
         self.level = 1
+        self.set_stage_seed()
         self.level_special = self.select_a_special()
         self.level_matrix = self.generate_level_matrix(gs.ROWS, gs.COLS)
         self.level_info = InfoPanel(self, self.ASSETS)
 
         self.level_transition = LevelTransition(self, self.ASSETS, self.level)
         self.start_screen_music.stop()
+        self.precompute_next_stage()
 
 
     def check_top_score(self, player_score):
@@ -376,7 +594,7 @@ class LevelTransition(pygame.sprite.Sprite):
         self.stage_num = stage_num
 
         self.time = 2800
-        self.timer = pygame.time.get_ticks()
+        self.timer = self.GAME.CLOCK.get_ticks()
 
         self.image = self.ASSETS.stage_word
         self.xpos = (gs.SCREENWIDTH // 2) - self.image.get_width() - 64
@@ -396,9 +614,17 @@ class LevelTransition(pygame.sprite.Sprite):
 
 
     def update(self):
-        if pygame.time.get_ticks() - self.timer >= self.time:
-            self.GAME.transition = False
-            self.kill()
+        #  The stage sprites are built a batch at a time while the stage number is showing
+        stage_built = self.GAME.build_stage_batch()
+        if stage_built and self.GAME.CLOCK.get_ticks() - self.timer >= self.time:
+            self.end_transition()
+
+
+    def end_transition(self):
+        """Finish building the stage, finish the transition and start playing the stage"""
+        self.GAME.finish_stage_build()
+        self.GAME.transition = False
+        self.kill()
 
 
     def draw(self, window):
@@ -2,9 +2,32 @@
 SCREENWIDTH = 1280
 SCREENHEIGHT = 892
 
-#  Game Frames per Second
+#  Game Frames per Second (rendering, can be raised for high refresh rate displays)
 FPS = 60
 
+#  Simulation Steps per Second, the game speed does not depend on the frame rate
+SIMULATION_RATE = 60
+
+#  Most simulation steps run for one rendered frame, before the simulation is allowed to fall behind
+MAX_STEPS_PER_FRAME = 5
+
+#  Only redraw and push the changed areas of the screen each frame
+DIRTY_RECT_RENDERING = True
+
+#  Show the per-frame counters (drawn/culled sprites etc.) in the window caption
+SHOW_FRAME_STATS = False
+
+#  Training Environment
+#  Steps before an episode is cut short (the stage time at the simulation rate), and the reward for losing a life
+ENV_MAX_STEPS = 200 * 60
+ENV_LIFE_LOST_REWARD = -1000
+
+#  Number of generated stage layouts kept, so a stage restarted after a death is reloaded instead of regenerated
+LAYOUT_CACHE_SIZE = 64
+
+#  Number of stage sprites built per frame during the level transition
+STAGE_BUILD_BATCH = 32
+
 #  Y Coordinates Offset
 Y_OFFSET = 92
 
@@ -22,11 +45,26 @@ ENEMIES = {"ballom": {"speed": 1, "wall_hack": False, "chase_player": False, "Lo
            "pontan": {"speed": 4, "wall_hack": True, "chase_player": True, "LoS": 30, "see_player_hack": False}
            }
 
+#  Enemy AI Level of Detail
+#  Enemies within "distance" pixels of the camera view or of the player are updated every "interval" frames,
+#  a distance of None covers any distance. Intervals should be powers of 2, so the enemy movement can stay
+#  aligned with the grid
+AI_TIERS = [{"distance": 128, "interval": 1},
+            {"distance": 640, "interval": 2},
+            {"distance": None, "interval": 4}]
+
 #  Game Matrix
 SIZE = 64
 ROWS = 12
 COLS = 30
 
+#  Level Matrix Cell Types
+CELL_EMPTY = 0
+CELL_HARD = 1
+CELL_SOFT = 2
+CELL_BOMB = 3
+CELL_SPECIAL = 4
+
 #  Colours
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
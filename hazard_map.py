@@ -0,0 +1,68 @@
+from level_grid import LevelGrid
+
+
+class HazardMap:
+    #  Layers of the map, the sprites that kill what they touch
+    LAYERS = ("flames", "enemies")
+
+    def __init__(self):
+        #  Sprites of each layer centred in each cell, keyed by layer, then by (row, col)
+        self.layers = {layer: {} for layer in self.LAYERS}
+
+        #  Layer and cell of each sprite in the map, keyed by sprite
+        self.positions = {}
+
+
+    def add(self, item, layer):
+        """Add a sprite to a layer, in the cell under its centre"""
+        row, col = LevelGrid.rect_cell(item.rect)
+        self.layers[layer].setdefault((row, col), []).append(item)
+        self.positions[item] = (layer, row, col)
+
+
+    def remove(self, item):
+        """Remove a sprite from the map"""
+        position = self.positions.pop(item, None)
+        if position is None:
+            return
+        layer, row, col = position
+        cells = self.layers[layer]
+        items = cells[(row, col)]
+        items.remove(item)
+        if not items:
+            del cells[(row, col)]
+
+
+    def move(self, item):
+        """Update the cell of a sprite in the map, if it has moved into a new cell"""
+        layer, old_row, old_col = self.positions[item]
+        row, col = LevelGrid.rect_cell(item.rect)
+        if row == old_row and col == old_col:
+            return
+        self.remove(item)
+        self.layers[layer].setdefault((row, col), []).append(item)
+        self.positions[item] = (layer, row, col)
+
+
+    def clear(self):
+        """Remove every sprite, when the stage is cleared"""
+        for cells in self.layers.values():
+            cells.clear()
+        self.positions.clear()
+
+
+    def nearby(self, layer, rect):
+        """Return the sprites of a layer that may touch a cell sized rect: the sprites centred in the cell under
+        the rect centre, or in one of the 8 cells around it"""
+        cells = self.layers[layer]
+        if not cells:
+            return ()
+        row, col = LevelGrid.rect_cell(rect)
+        get = cells.get
+        items = []
+        for near_row in (row - 1, row, row + 1):
+            for near_col in (col - 1, col, col + 1):
+                found = get((near_row, near_col))
+                if found:
+                    items.extend(found)
+        return items
@@ -0,0 +1,92 @@
+from assets import Assets
+from game import Game
+from clock import SimulationClock
+from level_grid import LevelGrid
+
+
+class HeadlessBomberMan:
+    def __init__(self, skip_transitions=True):
+        """Run the game logic without a window or sound, stepping a virtual clock as fast as the CPU allows"""
+        self.ASSETS = Assets(headless=True)
+        self.CLOCK = SimulationClock()
+        self.GAME = Game(self, self.ASSETS, self.CLOCK)
+
+        #  Skip the stage number screens between stages
+        self.skip_transitions = skip_transitions
+
+        self.run = True
+
+
+    def new_game(self, seed=None):
+        """Start a new game from a seed (random if None), returns the starting state"""
+        self.GAME.new_game(seed)
+        self.end_transition()
+        return self.state()
+
+
+    def step(self, inputs=None):
+        """Advance the simulation by one tick with the player inputs, returns the new state.
+        inputs: {"move": "walk_left"/"walk_right"/"walk_up"/"walk_down"/None, "bomb": bool, "detonate": bool}"""
+        self.GAME.begin_step()
+        if self.GAME.game_on:
+            self.GAME.player.controls(**(inputs or {}))
+        self.GAME.update()
+        self.CLOCK.advance()
+        self.end_transition()
+        return self.state()
+
+
+    def replay(self, seed, inputs):
+        """Start a game from a seed and play a list of per tick inputs, returns the trace of (state, enemy positions)
+        after each tick. The tick number is left out, as the clock keeps running from game to game"""
+        self.new_game(seed)
+        trace = []
+        for tick_inputs in inputs:
+            state = self.step(tick_inputs)
+            del state["tick"]
+            trace.append((state, sorted(enemy.rect.topleft for enemy in self.GAME.groups["enemies"])))
+        return trace
+
+
+    def end_transition(self):
+        """End a level transition straight away, if transitions are skipped"""
+        if self.skip_transitions and self.GAME.transition:
+            self.GAME.level_transition.end_transition()
+
+
+    def state(self):
+        """Return a summary of the game state"""
+        game = self.GAME
+        if not game.game_on:
+            return {"tick": self.CLOCK.steps, "game_on": False, "top_score": game.top_score}
+        player = game.player
+        return {"tick": self.CLOCK.steps,
+                "game_on": True,
+                "transition": game.transition,
+                "level": game.level,
+                "time": game.level_info.time,
+                "score": player.score,
+                "lives": player.lives,
+                "alive": player.alive,
+                "player": LevelGrid.rect_cell(player.rect),
+                "enemies": len(game.groups["enemies"]),
+                "bombs": len(game.groups["bomb"])}
+
+
+if __name__ == "__main__":
+    #  Replay check: a reused engine plays the same seed and inputs the same way, after another game
+    import random
+    rng = random.Random(0)
+    moves = [{}, {"move": "walk_up"}, {"move": "walk_down"}, {"move": "walk_left"}, {"move": "walk_right"},
+             {"bomb": True}]
+    inputs = [move for move in (rng.choice(moves) for _ in range(100)) for _ in range(9)]
+
+    engine = HeadlessBomberMan()
+    first = engine.replay(11, inputs)
+    engine.replay(99, inputs[:7])
+    second = engine.replay(11, inputs)
+    if first == second:
+        print(f"replay matches over {len(inputs)} ticks")
+    else:
+        tick = next(tick for tick, (a, b) in enumerate(zip(first, second)) if a != b)
+        raise SystemExit(f"replay differs from tick {tick}")
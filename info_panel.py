@@ -1,4 +1,5 @@
 import pygame
+from renderer import blit_sequence
 import gamesettings as gs
 
 
@@ -16,19 +17,24 @@ class InfoPanel:
         self.player_lives_left_word = self.images.left_word
 
         #  Player score
-        self.score_image = self.update_score_image(self.GAME.player.score)
+        self.score = self.GAME.player.score
+        self.score_image = self.update_score_image(self.score)
+
+        #  Redraw the info panel on the next frame
+        self.dirty = True
 
 
     def set_timer(self):
         #  Level Timer
         self.time_total = gs.STAGE_TIME
-        self.timer_start = pygame.time.get_ticks()
+        self.timer_start = self.GAME.CLOCK.get_ticks()
         self.time = 200
 
         #  Images for Info Panel
         self.time_image = self.update_time_image()
         self.time_word_image = self.images.time_word
         self.time_word_rect = self.time_word_image.get_rect(topleft=(32, 32))
+        self.dirty = True
 
 
     def update_time_image(self):
@@ -40,35 +46,42 @@ class InfoPanel:
 
     def update(self):
         #  Update the score
-        self.score_image = self.update_score_image(self.GAME.player.score)
+        if self.score != self.GAME.player.score:
+            self.score = self.GAME.player.score
+            self.score_image = self.update_score_image(self.score)
+            self.dirty = True
 
         #  If timer reaches zero, stop the counter
         if self.time == 0:
             return
 
         #  Timer countdown, change the timer image every second
-        if pygame.time.get_ticks() - self.timer_start >= 1000:
-            self.timer_start = pygame.time.get_ticks()
+        if self.GAME.CLOCK.get_ticks() - self.timer_start >= 1000:
+            self.timer_start = self.GAME.CLOCK.get_ticks()
             self.time -= 1
             self.time_image = self.update_time_image()
+            self.dirty = True
             if self.time == 0:
-                self.GAME.insert_enemies_into_level(self.GAME.level_matrix, ["pontan" for _ in range(10)])
+                self.GAME.spawn_enemies(["pontan" for _ in range(10)])
 
 
     def draw(self, window):
         #  Draw the Time indicator to the screen
-        window.blit(self.time_word_image, self.time_word_rect)
+        blits = [(self.time_word_image, self.time_word_rect)]
         start_x = 192 if len(self.time_image) == 3 else 224 if len(self.time_image) == 2 else 256
         for num, image in enumerate(self.time_image):
-            window.blit(image, (start_x + (32 * num), 32))
+            blits.append((image, (start_x + (32 * num), 32)))
         #  Player Score Images
         start_x = ((gs.SCREENWIDTH // 2) + 64) - (len(self.score_image) * 32)
         for num, image in enumerate(self.score_image):
-            window.blit(image, (start_x + (32 * num), 32))
+            blits.append((image, (start_x + (32 * num), 32)))
 
         #  Players lives left
-        window.blit(self.player_lives_left_word, (1032, 32))
-        window.blit(self.black_nums[self.GAME.player.lives][0], (1184, 32))
+        blits.append((self.player_lives_left_word, (1032, 32)))
+        blits.append((self.black_nums[self.GAME.player.lives][0], (1184, 32)))
+
+        #  The whole panel is drawn in one call
+        blit_sequence(window, blits)
 
 
     def update_score_image(self, score):
@@ -80,17 +93,23 @@ class InfoPanel:
         return score_images
 
 
-class Scoring(pygame.sprite.Sprite):
-    score_bonus = 0
-
+class Scoring(pygame.sprite.DirtySprite):
     def __init__(self, game, group, score, xpos, ypos):
-        super().__init__(group)
-        Scoring.score_bonus += 1
+        super().__init__()
+        self.reset(game, group, score, xpos, ypos)
+
 
+    def reset(self, game, group, score, xpos, ypos):
+        """Set up the score, when created or reused from the scoring pool"""
+        self.add(group)
         self.GAME = game
-        self.score = score if Scoring.score_bonus <= 1 else score * 2
+        self.dirty = 1
+        self.GAME.score_bonus += 1
 
-        self.time = pygame.time.get_ticks()
+        self.score = score if self.GAME.score_bonus <= 1 else score * 2
+
+        #  The score shows for a second, then is added to the player score
+        self.GAME.timers.schedule(1000, self.expire)
 
         self.x = xpos
         self.y = ypos
@@ -98,11 +117,9 @@ class Scoring(pygame.sprite.Sprite):
         self.image = self.GAME.ASSETS.score_images[self.score][0]
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
 
-    def update(self):
-        if pygame.time.get_ticks() - self.time >= 1000:
-            self.kill()
-            Scoring.score_bonus -= 1
-            self.GAME.player.update_score(self.score)
-
-    def draw(self, window, x_offset):
-        window.blit(self.image, (self.rect.x - x_offset, self.rect.y))
\ No newline at end of file
+    def expire(self):
+        """Remove the score and add it to the player score, run by the game timers"""
+        self.kill()
+        self.GAME.score_bonus -= 1
+        self.GAME.pools["scoring"].release(self)
+        self.GAME.player.update_score(self.score)
\ No newline at end of file
@@ -0,0 +1,194 @@
+import pygame
+import numpy as np
+import gamesettings as gs
+
+
+class NoFreeCellError(Exception):
+    """Raised when there is no empty cell left to spawn into"""
+
+
+class LevelGrid:
+    #  Side table entry of the cells holding tile data only, with no object (hard blocks)
+    TILE = "#"
+
+    def __init__(self, rows, cols, listener=None):
+        self.rows = rows
+        self.cols = cols
+
+        #  Cell type of every cell in the level
+        self.cells = np.full((rows, cols), gs.CELL_EMPTY, dtype=np.uint8)
+
+        #  Side table of the objects occupying the cells, "_" for an empty cell
+        self.entities = [["_" for col in range(cols)] for row in range(rows)]
+
+        #  Row and column number of every cell, used for the area queries
+        self.row_nums, self.col_nums = np.indices((rows, cols))
+
+        #  Empty cells kept in a list with the position of each cell in it, for O(1) random picks and updates
+        self.free_list = [(row, col) for row in range(rows) for col in range(cols)]
+        self.free_index = {cell: index for index, cell in enumerate(self.free_list)}
+
+        #  Incremented on every change, so derived data (e.g. flow fields) knows when to recalculate
+        self.version = 0
+
+        #  Object told of every cell change, with a cell_changed(row, col, cell_type, value) method (e.g. the observation)
+        self.listener = listener
+
+
+    def __getitem__(self, row):
+        """Return a row of the object side table, so the grid can be read as grid[row][col]"""
+        return self.entities[row]
+
+
+    def __len__(self):
+        return self.rows
+
+
+    def set_cell(self, row, col, value):
+        """Place an object (or "_" for empty) into a cell, keeping the cell types in sync"""
+        self.update_cell(row, col, gs.CELL_EMPTY if value == "_" else value.cell_type, value)
+
+
+    def set_tiles(self, mask, cell_type):
+        """Fill the cells of a mask with tile data of a cell type (e.g. the hard blocks), without any objects"""
+        for row, col in self.cell_list(mask):
+            self.update_cell(row, col, cell_type, self.TILE)
+
+
+    def update_cell(self, row, col, cell_type, value):
+        """Set the cell type and side table entry of a cell, and the free cell list"""
+        self.entities[row][col] = value
+        self.cells[row, col] = cell_type
+        if cell_type == gs.CELL_EMPTY:
+            self.add_free_cell((row, col))
+        else:
+            self.remove_free_cell((row, col))
+        self.version += 1
+        if self.listener:
+            self.listener.cell_changed(row, col, cell_type, value)
+
+
+    def add_free_cell(self, cell):
+        """Add a cell to the free cell list, if not already in it"""
+        if cell not in self.free_index:
+            self.free_index[cell] = len(self.free_list)
+            self.free_list.append(cell)
+
+
+    def remove_free_cell(self, cell):
+        """Remove a cell from the free cell list, moving the last cell into its place"""
+        index = self.free_index.pop(cell, None)
+        if index is None:
+            return
+        last = self.free_list.pop()
+        if last != cell:
+            self.free_list[index] = last
+            self.free_index[last] = index
+
+
+    def swap_free_cells(self, cell, index):
+        """Swap a cell in the free cell list with the cell at index"""
+        other = self.free_list[index]
+        self.free_list[self.free_index[cell]] = other
+        self.free_index[other] = self.free_index[cell]
+        self.free_list[index] = cell
+        self.free_index[cell] = index
+
+
+    def pick_free_cells(self, count, rng, row, col, distance):
+        """Randomly pick count empty cells (a cell can be picked more than once) more than distance cells from
+        row/col, raises NoFreeCellError if there are none"""
+        #  Move the free cells near row/col to the end of the list, and pick from the cells before them
+        near = 0
+        for near_row in range(max(row - distance, 0), min(row + distance + 1, self.rows)):
+            for near_col in range(max(col - distance, 0), min(col + distance + 1, self.cols)):
+                if (near_row, near_col) in self.free_index:
+                    near += 1
+                    self.swap_free_cells((near_row, near_col), len(self.free_list) - near)
+
+        eligible = len(self.free_list) - near
+        if eligible <= 0:
+            raise NoFreeCellError(f"No empty cell more than {distance} cells from {(row, col)}")
+        return [self.free_list[rng.randrange(eligible)] for _ in range(count)]
+
+
+    def hard_block_cells(self):
+        """Return a mask of the cells holding the hard barrier blocks: the border and every even row/col cell"""
+        return (self.row_nums == 0) | (self.row_nums == self.rows - 1) | \
+            (self.col_nums == 0) | (self.col_nums == self.cols - 1) | \
+            ((self.row_nums % 2 == 0) & (self.col_nums % 2 == 0))
+
+
+    def tile_rects(self, rect):
+        """Return the rects of the tile cells (hard blocks) that a rect overlaps (1 to 4 cells for a 64px rect)"""
+        rects = []
+        for row in range((rect.top - gs.Y_OFFSET) // gs.SIZE, ((rect.bottom - 1 - gs.Y_OFFSET) // gs.SIZE) + 1):
+            entities = self.entities[row]
+            for col in range(rect.left // gs.SIZE, ((rect.right - 1) // gs.SIZE) + 1):
+                if entities[col] is self.TILE:
+                    rects.append(pygame.Rect(col * gs.SIZE, row * gs.SIZE + gs.Y_OFFSET, gs.SIZE, gs.SIZE))
+        return rects
+
+
+    def free_cells(self):
+        """Return a mask of the empty cells"""
+        return self.cells == gs.CELL_EMPTY
+
+
+    def cells_within(self, row, col, distance):
+        """Return a mask of the cells within a number of cells of row/col, in any direction"""
+        return (np.abs(self.row_nums - row) <= distance) & (np.abs(self.col_nums - col) <= distance)
+
+
+    def open_neighbours(self, row, col):
+        """Return the directions of the empty cells next to row/col"""
+        #                              up,      down,    left,    right
+        neighbours = self.cells[[row - 1, row + 1, row, row], [col, col, col - 1, col + 1]]
+        return [direction for direction, cell in zip(["up", "down", "left", "right"], neighbours)
+                if cell == gs.CELL_EMPTY]
+
+
+    def line_blocked(self, start_pos, end_pos, blocking_types):
+        """Walk the cells that the line between two pixel positions passes through, in order from the start,
+        returns True at the first cell of one of the blocking types"""
+        #  Line end points in cell units, measured from the pixel centres
+        x0, y0 = (start_pos[0] + 0.5) / gs.SIZE, (start_pos[1] - gs.Y_OFFSET + 0.5) / gs.SIZE
+        x1, y1 = (end_pos[0] + 0.5) / gs.SIZE, (end_pos[1] - gs.Y_OFFSET + 0.5) / gs.SIZE
+        row, col = int(y0), int(x0)
+        step_row = 1 if y1 > y0 else -1
+        step_col = 1 if x1 > x0 else -1
+
+        #  Fraction of the line travelled when the next row/col boundary is crossed, and between boundaries
+        row_delta = 1 / abs(y1 - y0) if y1 != y0 else float("inf")
+        col_delta = 1 / abs(x1 - x0) if x1 != x0 else float("inf")
+        next_row = ((row + 1 - y0) if step_row > 0 else (y0 - row)) * row_delta if y1 != y0 else float("inf")
+        next_col = ((col + 1 - x0) if step_col > 0 else (x0 - col)) * col_delta if x1 != x0 else float("inf")
+
+        #  The line passes through one cell, plus one more for every row and col boundary crossed
+        for _ in range(abs(int(y1) - row) + abs(int(x1) - col) + 1):
+            if self.cells[row, col] in blocking_types:
+                return True
+            if next_col < next_row:
+                next_col += col_delta
+                col += step_col
+            else:
+                next_row += row_delta
+                row += step_row
+        return False
+
+
+    def cells_from_bytes(self, data):
+        """Return a cell type array of the grid size from bytes (as stored by the layout cache)"""
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.rows, self.cols)
+
+
+    @staticmethod
+    def cell_list(mask):
+        """Return a list of (row, col) tuples for the cells of a mask"""
+        return [(int(row), int(col)) for row, col in np.argwhere(mask)]
+
+
+    @staticmethod
+    def rect_cell(rect):
+        """Return the (row, col) of the cell under the centre of a rect"""
+        return (rect.centery - gs.Y_OFFSET) // gs.SIZE, rect.centerx // gs.SIZE
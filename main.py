@@ -1,6 +1,7 @@
 import pygame
 from assets import Assets
 from game import Game
+from clock import SimulationClock
 import gamesettings as gs
 
 
@@ -13,8 +14,10 @@ class BomberMan:
         pygame.display.set_caption("BomberMan")
 
         self.ASSETS = Assets()
-        self.GAME = Game(self, self.ASSETS)
+        self.CLOCK = SimulationClock()
+        self.GAME = Game(self, self.ASSETS, self.CLOCK)
         self.FPS = pygame.time.Clock()
+        self.stats_timer = pygame.time.get_ticks()
 
         self.run = True
 
@@ -24,21 +27,55 @@ class BomberMan:
 
 
     def update(self):
-        self.FPS.tick(gs.FPS)
         self.GAME.update()
+        self.CLOCK.advance()
 
 
-    def draw(self, window):
-        window.fill(gs.BLACK)
-        self.GAME.draw(window)
-        pygame.display.update()
+    def step(self):
+        """Run one fixed time step of the simulation"""
+        self.GAME.begin_step()
+        self.input()
+        self.update()
+
+
+    def draw(self, window, alpha=1.0):
+        dirty_rects = self.GAME.draw(window, alpha)
+        #  Only push the changed areas of the screen, unless the whole screen has changed
+        if dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty_rects)
+
+        if gs.SHOW_FRAME_STATS:
+            self.show_frame_stats()
+
+
+    def show_frame_stats(self):
+        """Show the per-frame counters in the window caption, once per second"""
+        if pygame.time.get_ticks() - self.stats_timer < 1000:
+            return
+        self.stats_timer = pygame.time.get_ticks()
+        stats = " ".join(f"{key} {value}" for key, value in self.GAME.frame_stats().items())
+        pygame.display.set_caption(f"BomberMan | fps {self.FPS.get_fps():.0f} | {stats}")
 
 
     def rungame(self):
+        #  Real time not yet simulated, in milliseconds
+        accumulator = 0
         while self.run == True:
-            self.input()
-            self.update()
-            self.draw(self.screen)
+            accumulator += self.FPS.tick(gs.FPS)
+
+            #  Run as many fixed simulation steps as the elapsed time covers
+            steps = 0
+            while accumulator >= self.CLOCK.step_ms and steps < gs.MAX_STEPS_PER_FRAME and self.run:
+                self.step()
+                accumulator -= self.CLOCK.step_ms
+                steps += 1
+            #  If the simulation can not keep up, drop the time it is behind by rather than spiral
+            accumulator = min(accumulator, self.CLOCK.step_ms)
+
+            #  Draw, interpolating the moving sprites between the last two steps
+            self.draw(self.screen, accumulator / self.CLOCK.step_ms)
 
 
 if __name__=="__main__":
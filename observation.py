@@ -0,0 +1,88 @@
+import numpy as np
+from level_grid import LevelGrid
+import gamesettings as gs
+
+
+class ObservationEncoder:
+    #  Channels of the encoded game state, one (rows, cols) plane each
+    CHANNELS = ["hard_block", "soft_block", "bomb", "flame", "special", "player"] + \
+               [f"enemy_{enemy}" for enemy in gs.ENEMIES]
+
+    #  Channels following the level matrix cell types
+    CELL_CHANNELS = {gs.CELL_HARD: "hard_block", gs.CELL_SOFT: "soft_block",
+                     gs.CELL_BOMB: "bomb", gs.CELL_SPECIAL: "special"}
+
+    #  Bomb channel value of a remote bomb, which has no fuse
+    NO_FUSE = 255
+
+    def __init__(self, rows, cols):
+        """Multi-channel array of the game state, updated as the entities change.
+        Cell channels hold 1 for an occupied cell, the bomb channel the fuse left (in animation frames, plus 1),
+        and the flame, player and enemy channels a count of the sprites centred in each cell"""
+        self.channel = {name: index for index, name in enumerate(self.CHANNELS)}
+        self.array = np.zeros((len(self.CHANNELS), rows, cols), dtype=np.uint8)
+        self.cell_channels = [self.channel[name] for name in self.CELL_CHANNELS.values()]
+
+        #  Read only view for the consumers, sharing the array memory
+        self.view = self.array.view()
+        self.view.flags.writeable = False
+
+        #  Channel and cell of each tracked sprite, keyed by sprite
+        self.positions = {}
+
+
+    def buffer(self):
+        """Return a read only memoryview of the array, without copying"""
+        return memoryview(self.view)
+
+
+    def reset(self):
+        """Clear the array for a new level, keeping the sprites still in a group (the player)"""
+        self.array.fill(0)
+        for item, (channel, row, col) in list(self.positions.items()):
+            if item.groups():
+                self.array[channel, row, col] += 1
+            else:
+                del self.positions[item]
+
+
+    def cell_changed(self, row, col, cell_type, value):
+        """Level matrix callback, update the cell channels with the cell type (and object) placed in a cell"""
+        self.array[self.cell_channels, row, col] = 0
+        if cell_type == gs.CELL_EMPTY:
+            return
+        self.array[self.channel[self.CELL_CHANNELS[cell_type]], row, col] = 1
+        if cell_type == gs.CELL_BOMB:
+            self.bomb_fuse(value)
+
+
+    def bomb_fuse(self, bomb):
+        """Update the fuse left of a bomb"""
+        fuse = self.NO_FUSE if bomb.remote else max(bomb.bomb_timer - bomb.bomb_counter, 0) + 1
+        self.array[self.channel["bomb"], bomb.row, bomb.col] = fuse
+
+
+    def track(self, item, channel):
+        """Start counting a sprite in a channel, at the cell under its centre (moving it if already counted)"""
+        self.untrack(item)
+        row, col = LevelGrid.rect_cell(item.rect)
+        self.positions[item] = (self.channel[channel], row, col)
+        self.array[self.channel[channel], row, col] += 1
+
+
+    def untrack(self, item):
+        """Stop counting a sprite"""
+        position = self.positions.pop(item, None)
+        if position:
+            self.array[position] -= 1
+
+
+    def move(self, item):
+        """Update the cell of a tracked sprite, if it has moved into a new cell"""
+        channel, old_row, old_col = self.positions[item]
+        row, col = LevelGrid.rect_cell(item.rect)
+        if row == old_row and col == old_col:
+            return
+        self.array[channel, old_row, old_col] -= 1
+        self.array[channel, row, col] += 1
+        self.positions[item] = (channel, row, col)
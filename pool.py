@@ -0,0 +1,27 @@
+class SpritePool:
+    def __init__(self, sprite_class, name):
+        #  Class of the pooled sprites, which must have a reset method taking the constructor arguments
+        self.sprite_class = sprite_class
+
+        #  Killed sprites waiting to be reused
+        self.free = []
+
+        #  Sprites reused from the pool (hits), and sprites that had to be created (misses)
+        self.stats = {f"{name}_pool_hits": 0, f"{name}_pool_misses": 0}
+        self.hits_key, self.misses_key = self.stats
+
+
+    def get(self, *args):
+        """Return a sprite set up with the constructor arguments, reusing a free sprite if there is one"""
+        if self.free:
+            self.stats[self.hits_key] += 1
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            return sprite
+        self.stats[self.misses_key] += 1
+        return self.sprite_class(*args)
+
+
+    def release(self, sprite):
+        """Return a killed sprite to the pool"""
+        self.free.append(sprite)
@@ -0,0 +1,144 @@
+import pygame
+import gamesettings as gs
+
+
+def blit_sequence(window, blits):
+    """Blit a list of (image, position) pairs in one call, with Surface.fblits where pygame has it (pygame-ce)"""
+    if hasattr(window, "fblits"):
+        window.fblits(blits)
+    else:
+        window.blits(blits, doreturn=False)
+
+
+class Renderer:
+    def __init__(self, game):
+        #  Link with the game class
+        self.GAME = game
+
+        #  Screen areas
+        self.screen_rect = pygame.Rect(0, 0, gs.SCREENWIDTH, gs.SCREENHEIGHT)
+        self.info_panel_rect = pygame.Rect(0, 0, gs.SCREENWIDTH, gs.Y_OFFSET)
+
+        #  Dirty rectangle tracking
+        self.full_redraw = True
+        self.last_camera_x_offset = None
+        self.drawn_rects = {}
+
+        #  Per frame counters of drawn and off screen sprites
+        self.stats = {"drawn": 0, "culled": 0}
+
+
+    def force_full_redraw(self):
+        """Redraw the whole screen on the next frame"""
+        self.full_redraw = True
+
+
+    def draw(self, window):
+        """Draw the level, returns the list of changed screen areas, or None if the whole screen changed"""
+        offset = self.GAME.render_camera_x_offset()
+        self.stats["drawn"] = 0
+        self.stats["culled"] = 0
+        if not gs.DIRTY_RECT_RENDERING or self.full_redraw or offset != self.last_camera_x_offset:
+            self.draw_full(window, offset)
+            return None
+        return self.draw_dirty(window, offset)
+
+
+    def draw_full(self, window, offset):
+        """Redraw every part of the level"""
+        window.fill(gs.GREY)
+        self.GAME.level_info.draw(window)
+        self.draw_background(window, offset)
+
+        self.drawn_rects = {}
+        blits = []
+        for item in self.level_sprites():
+            item.dirty = 0
+            screen_rect = self.sprite_screen_rect(item, offset)
+            #  Skip sprites that are outside of the camera view
+            if not screen_rect.colliderect(self.screen_rect):
+                self.stats["culled"] += 1
+                continue
+            if item.visible:
+                blits.append((item.image, screen_rect.topleft))
+            self.stats["drawn"] += 1
+            self.drawn_rects[item] = screen_rect
+        #  Every sprite is drawn in one call, in drawing order
+        blit_sequence(window, blits)
+        self.GAME.level_info.dirty = False
+
+        self.full_redraw = False
+        self.last_camera_x_offset = offset
+
+
+    def draw_dirty(self, window, offset):
+        """Redraw only the screen areas where a sprite has changed, moved, appeared or disappeared"""
+        dirty_rects = []
+        drawn_rects = {}
+        for item in self.level_sprites():
+            screen_rect = self.sprite_screen_rect(item, offset)
+            old_rect = self.drawn_rects.pop(item, None)
+            #  Sprites outside of the camera view are not drawn, only the area they left needs clearing
+            if not screen_rect.colliderect(self.screen_rect):
+                self.stats["culled"] += 1
+                if old_rect:
+                    dirty_rects.append(old_rect)
+                item.dirty = 0
+                continue
+            drawn_rects[item] = screen_rect
+            if item.dirty or old_rect != screen_rect:
+                dirty_rects.append(screen_rect)
+                if old_rect:
+                    dirty_rects.append(old_rect)
+            if item.dirty < 2:
+                item.dirty = 0
+        #  Sprites left over from the last frame have been killed, clear the area they were drawn in
+        dirty_rects.extend(self.drawn_rects.values())
+        self.drawn_rects = drawn_rects
+
+        if self.GAME.level_info.dirty:
+            dirty_rects.append(self.info_panel_rect)
+            self.GAME.level_info.dirty = False
+
+        dirty_rects = [rect.clip(self.screen_rect) for rect in dirty_rects if rect.colliderect(self.screen_rect)]
+        for rect in dirty_rects:
+            self.redraw_area(window, rect, offset)
+        return dirty_rects
+
+
+    def redraw_area(self, window, area, offset):
+        """Restore the background within the area, then redraw the sprites overlapping it"""
+        window.set_clip(area)
+        window.fill(gs.GREY)
+        if area.colliderect(self.info_panel_rect):
+            self.GAME.level_info.draw(window)
+        self.draw_background(window, offset)
+        blits = []
+        for item, screen_rect in self.drawn_rects.items():
+            if screen_rect.colliderect(area):
+                if item.visible:
+                    blits.append((item.image, screen_rect.topleft))
+                self.stats["drawn"] += 1
+        blit_sequence(window, blits)
+        window.set_clip(None)
+
+
+    def sprite_screen_rect(self, item, offset):
+        """Return the screen area of a sprite, moving sprites are interpolated between simulation steps.
+        The sprites are drawn at the top left of this area"""
+        if hasattr(item, "previous_pos"):
+            x, y = item.render_position(self.GAME.render_alpha)
+            return pygame.Rect(x - offset, y, item.rect.width, item.rect.height)
+        return item.rect.move(-offset, 0)
+
+
+    def draw_background(self, window, offset):
+        """Draw the visible window of the pre-rendered level background (green squares and hard blocks)"""
+        window.blit(self.GAME.level_background, (0, gs.Y_OFFSET),
+                    (offset, 0, gs.SCREENWIDTH, gs.SCREENHEIGHT - gs.Y_OFFSET))
+
+
+    def level_sprites(self):
+        """Yield the sprites to be drawn, in drawing order (the hard blocks are tiles baked into the background)"""
+        for value in self.GAME.groups.values():
+            yield from value
@@ -3,7 +3,10 @@ import gamesettings as gs
 from info_panel import Scoring
 
 
-class Special(pygame.sprite.Sprite):
+class Special(pygame.sprite.DirtySprite):
+    __slots__ = ("GAME", "name", "row", "col", "size", "x", "y", "image", "rect", "score")
+    cell_type = gs.CELL_SPECIAL
+
     def __init__(self, game, image, name, group, row_num, col_num, size):
         super().__init__(group)
         self.GAME = game
@@ -23,30 +26,26 @@ class Special(pygame.sprite.Sprite):
         self.image = image
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
 
-        #  Power Up Abilities
-        self.power_up_activate = {"bomb_up": self.bomb_up_special,
-                                  "fire_up": self.fire_up_special,
-                                  "speed_up": self.speed_up_special,
-                                  "wall_hack": self.wall_hack_special,
-                                  "remote": self.remote_special,
-                                  "bomb_pass": self.bomb_hack_special,
-                                  "flame_pass": self.flame_pass_special,
-                                  "invincible": self.invincible_special,
-                                  "exit": self.end_stage}
-
         self.score = 1000 if self.name == "exit" else 500
 
+        #  Updated while the player is in or next to the special cell
+        self.GAME.active_sprites.add(self)
+
 
     def update(self):
+        row, col = self.GAME.player_cell
+        if abs(row - self.row) > 1 or abs(col - self.col) > 1:
+            self.GAME.active_sprites.remove(self)
+            return
         if self.GAME.player.rect.collidepoint(self.rect.center):
             #  Activate power up
-            self.power_up_activate[self.name](self.GAME.player)
+            self.power_up_activate[self.name](self, self.GAME.player)
             if self.name == "exit":
                 self.GAME.bg_music.stop()
                 self.GAME.bg_music_special.stop()
                 self.GAME.player.update_score(self.score)
                 return
-            self.GAME.level_matrix[self.row][self.col] = "_"
+            self.GAME.level_matrix.set_cell(self.row, self.col, "_")
             self.GAME.ASSETS.sounds["Bomberman SFX (4).wav"].play()
             self.GAME.bg_music.stop()
             self.GAME.bg_music_special.play(loops=-1)
@@ -55,8 +54,9 @@ class Special(pygame.sprite.Sprite):
             return
 
 
-    def draw(self,window, x_offset):
-        window.blit(self.image, (self.rect.x - x_offset, self.rect.y))
+    def kill(self):
+        self.GAME.active_sprites.remove(self)
+        super().kill()
 
 
     def bomb_up_special(self, player):
@@ -90,7 +90,7 @@ class Special(pygame.sprite.Sprite):
     def invincible_special(self, player):
         """Turn on the players invincibility"""
         player.invincibility = True
-        player.invincibility_timer = pygame.time.get_ticks()
+        player.invincibility_timer = self.GAME.CLOCK.get_ticks()
 
     def end_stage(self, player):
         """End the level, and generate a new level"""
@@ -105,4 +105,16 @@ class Special(pygame.sprite.Sprite):
         for _ in range(10):
             enemies.append(gs.SPECIAL_CONNECTIONS[self.name])
 
-        self.GAME.insert_enemies_into_level(self.GAME.level_matrix, enemies)
\ No newline at end of file
+        self.GAME.spawn_enemies(enemies)
+
+
+    #  Power Up Abilities, shared by every special
+    power_up_activate = {"bomb_up": bomb_up_special,
+                         "fire_up": fire_up_special,
+                         "speed_up": speed_up_special,
+                         "wall_hack": wall_hack_special,
+                         "remote": remote_special,
+                         "bomb_pass": bomb_hack_special,
+                         "flame_pass": flame_pass_special,
+                         "invincible": invincible_special,
+                         "exit": end_stage}
\ No newline at end of file
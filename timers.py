@@ -0,0 +1,55 @@
+import heapq
+
+
+class TimerScheduler:
+    def __init__(self, clock):
+        #  Simulation clock the timers are measured against
+        self.CLOCK = clock
+
+        #  Heap of [due time, order scheduled, callback], a cancelled timer has its callback set to None
+        self.heap = []
+        self.order = 0
+
+        #  Timers waiting to run, and the timers run in the last update
+        self.stats = {"timers_pending": 0, "timers_run": 0}
+
+
+    def schedule(self, delay, callback):
+        """Run the callback once delay milliseconds of simulation time have passed, returns the timer (to cancel)"""
+        timer = [self.CLOCK.get_ticks() + delay, self.order, callback]
+        self.order += 1
+        heapq.heappush(self.heap, timer)
+        self.stats["timers_pending"] += 1
+        return timer
+
+
+    def cancel(self, timer):
+        """Stop a timer from running, if it has not run already"""
+        if timer is not None and timer[2] is not None:
+            timer[2] = None
+            self.stats["timers_pending"] -= 1
+
+
+    def update(self):
+        """Run the timers that are due, in the order they are due (then the order they were scheduled)"""
+        now = self.CLOCK.get_ticks()
+        heap = self.heap
+        run = 0
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)
+            callback = timer[2]
+            if callback is None:
+                continue
+            timer[2] = None
+            self.stats["timers_pending"] -= 1
+            callback()
+            run += 1
+        self.stats["timers_run"] = run
+
+
+    def clear(self):
+        """Remove every timer, when the sprites they belong to are cleared for a new stage"""
+        for timer in self.heap:
+            timer[2] = None
+        self.heap.clear()
+        self.stats["timers_pending"] = 0